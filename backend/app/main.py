@@ -1,18 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
 
-from app.routers.search import router as search_router
-
-# Load environment variables
+# Load environment variables before the app modules read their settings
 load_dotenv()
 
+from app.routers.search import router as search_router, cache_warmer
+from app.services.warmer import CACHE_WARM_ENABLED
+from app.services.tinyfish import start_client, close_client
+from app.services.cache_backends import open_shared_cache, close_shared_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    await start_client()
+    await open_shared_cache()
+    if CACHE_WARM_ENABLED:
+        cache_warmer.start()
+    yield
+    await cache_warmer.stop()
+    await close_shared_cache()
+    await close_client()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="AI Job Aggregator",
     description="Search multiple job boards in parallel using AI web agents",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration - allow frontend to connect
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from enum import Enum
 
@@ -24,6 +24,14 @@ class SearchRequest(BaseModel):
     location: str
     experience_level: Optional[ExperienceLevel] = None
     job_boards: List[JobBoard]
+    # Serve stale cached results right away and refresh them in the background
+    allow_stale: bool = True
+    # Per-run agent timeout in seconds, instead of each board's learned one
+    timeout_seconds: Optional[float] = Field(default=None, gt=0)
+    # End the search after this many seconds with whatever has finished
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+    # Past the deadline, let unfinished boards keep running to fill the cache
+    finish_in_background: bool = True
 
 
 class JobResult(BaseModel):
@@ -34,6 +42,8 @@ class JobResult(BaseModel):
     url: str
     source: str
     posted_date: Optional[str] = None
+    # posted_date as an epoch timestamp, worked out when the job was fetched
+    posted_at: Optional[float] = None
     description: Optional[str] = None
 
 
@@ -51,3 +61,8 @@ class AgentUpdate(BaseModel):
     streaming_url: Optional[str] = None
     jobs: Optional[List[JobResult]] = None
     error: Optional[str] = None
+    cached: Optional[bool] = None
+    stale: Optional[bool] = None
+    age_seconds: Optional[int] = None
+    timed_out: Optional[bool] = None
+    skipped: Optional[bool] = None
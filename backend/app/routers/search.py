@@ -1,115 +1,387 @@
 import asyncio
 import json
-import re
-from datetime import datetime, timedelta
-from fastapi import APIRouter
+import time
+from fastapi import APIRouter, Request
 from starlette.responses import StreamingResponse
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional, Set
 
 from app.models.schemas import SearchRequest, JobBoard, AgentStatus
-from app.services.tinyfish import run_tinyfish_agent
-from app.services.job_boards import JOB_BOARD_CONFIGS, build_search_url
+from app.services.tinyfish import run_tinyfish_agent, rate_limiter, REQUEST_TIMEOUT
+from app.services.job_boards import JOB_BOARD_CONFIGS, build_search_url, board_uses_location
+from app.services.cache import (
+    ResultCache,
+    TieredResultCache,
+    RESULT_CACHE_TTL,
+    RESULT_CACHE_STALE_TTL,
+    NEGATIVE_CACHE_ERROR_TTL,
+    NEGATIVE_CACHE_EMPTY_TTL,
+)
+from app.services.singleflight import SingleFlight
+from app.services.query import canonicalize_query, location_matches
+from app.services.warmer import CacheWarmer, CACHE_WARM_AHEAD
+from app.services.limiter import ConcurrencyLimiter, AdaptiveLimit, ADAPTIVE_CONCURRENCY
+from app.services.board_stats import BoardStats, OUTCOME_OK, OUTCOME_ERROR, OUTCOME_TIMEOUT
+from app.services.retry import RetryBudget
+from app.services.timeouts import learned_timeout
+from app.services.breaker import BoardBreakers, CLOSED, OPEN
+from app.services.planner import plan_board, order_plans, ACTION_STALE, ACTION_SKIP
+from app.services.hedging import (
+    HedgeBudget,
+    hedged_events,
+    HEDGE_ENABLED,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+)
+from app.utils.posted_date import parse_posted_date, posted_date_cache_info
 
 router = APIRouter()
 
 MAX_AGE_HOURS = 72
 
+# Recent per-board results, keyed by search URL, in this worker and in the
+# shared cache backend if one is configured. Never kept (or served stale)
+# longer than MAX_AGE_HOURS so a cached job can't outlive the freshness
+# window.
+result_cache = TieredResultCache(ResultCache(
+    ttl=min(RESULT_CACHE_TTL, MAX_AGE_HOURS * 3600),
+    stale_ttl=min(RESULT_CACHE_STALE_TTL, MAX_AGE_HOURS * 3600),
+))
 
-def is_within_max_age(posted_date: str | None) -> bool:
+# Caps open agent runs globally and per board, queueing the rest in FIFO order
+agent_limiter = ConcurrencyLimiter(board_limits={
+    board: config["max_concurrent_runs"]
+    for board, config in JOB_BOARD_CONFIGS.items()
+    if "max_concurrent_runs" in config
+})
+
+# Recent latency, outcome and yield of agent runs per board
+board_stats = BoardStats()
+
+# Moves agent_limiter's global cap with observed latency and error rates
+adaptive_limit = AdaptiveLimit(agent_limiter) if ADAPTIVE_CONCURRENCY else None
+
+# Stops starting agent runs for boards that keep failing
+board_breakers = BoardBreakers(probe_timeout=REQUEST_TIMEOUT + 60)
+
+# Caps hedged (backup) agent runs as a share of all runs
+hedge_budget = HedgeBudget()
+
+# How long the shared lock for a board search outlives its holder if that
+# worker dies, how often a live holder renews it, and how often the other
+# workers check for its result
+WORKER_LOCK_TTL = 60.0
+WORKER_LOCK_RENEW_INTERVAL = WORKER_LOCK_TTL / 3
+WORKER_LOCK_POLL_INTERVAL = 2.0
+
+# In-flight agent runs, keyed by search URL, shared by concurrent searches
+board_flights = SingleFlight()
+
+# Max updates buffered between the board tasks and the SSE stream
+SSE_QUEUE_SIZE = 100
+
+# Seconds of silence before an SSE heartbeat comment is sent. Also how often
+# the client connection is checked while a search is running.
+HEARTBEAT_INTERVAL = 15.0
+
+# Sentinel a board task puts on the queue once it has no more updates
+_BOARD_DONE = object()
+
+
+def is_within_max_age(posted_date: str | None, now: Optional[float] = None) -> bool:
     """
     Check if a posted_date string represents a job posted within MAX_AGE_HOURS
-    of the current date/time.
+    of `now` (default: the current time). Unparseable dates are excluded to
+    be safe.
+    """
+    now = time.time() if now is None else now
+    posted_at = parse_posted_date(posted_date, now)
+    return posted_at is not None and posted_at >= now - MAX_AGE_HOURS * 3600
+
 
-    Handles:
-    - Relative: "2 days ago", "1 hour ago", "just now", "today"
-    - Short form: "1d", "2h"
-    - Absolute: "Feb 10, 2026", "2026-02-10", "02/10/2026"
+def filter_recent_jobs(
+    jobs: List[dict], now: Optional[float] = None, stored_at: Optional[float] = None
+) -> List[dict]:
     """
-    if not posted_date:
-        return False
+    Jobs posted within MAX_AGE_HOURS of `now`, by the posted_at timestamp
+    normalize_jobs gave them, with the cutoff worked out once. Jobs without
+    a posted_at key (cached before it existed) have their posted_date read
+    as of `stored_at`, when they were fetched (default: `now`).
+    """
+    now = time.time() if now is None else now
+    stored_at = now if stored_at is None else stored_at
+    cutoff = now - MAX_AGE_HOURS * 3600
+    recent = []
+    for job in jobs:
+        if "posted_at" in job:
+            posted_at = job["posted_at"]
+        else:
+            posted_at = parse_posted_date(job.get("posted_date"), stored_at)
+        if posted_at is not None and posted_at >= cutoff:
+            recent.append(job)
+    return recent
 
-    text = posted_date.lower().strip()
-    now = datetime.now()
-    cutoff = now - timedelta(hours=MAX_AGE_HOURS)
-
-    # "just now", "today", "just posted", "recently posted" → always recent
-    if any(kw in text for kw in ["just", "now", "today", "moment", "recently"]):
-        return True
-
-    # Try to parse "N <unit> ago" patterns
-    match = re.search(r"(\d+)\s*(second|minute|hour|day|week|month|year)s?\s*ago", text)
-    if match:
-        num = int(match.group(1))
-        unit = match.group(2)
-        hours_map = {
-            "second": 0, "minute": 0, "hour": 1,
-            "day": 24, "week": 168, "month": 730, "year": 8760,
-        }
-        total_hours = num * hours_map.get(unit, 0)
-        return total_hours <= MAX_AGE_HOURS
-
-    # Try bare number patterns like "1d", "2h"
-    match = re.search(r"(\d+)\s*(s|m|h|d|w|mo|yr)", text)
-    if match:
-        num = int(match.group(1))
-        unit = match.group(2)
-        unit_map = {"s": 0, "m": 0, "h": 1, "d": 24, "w": 168, "mo": 730, "yr": 8760}
-        hours = num * unit_map.get(unit, 0)
-        return hours <= MAX_AGE_HOURS
-
-    # Try absolute date formats
-    date_formats = [
-        "%Y-%m-%d",          # 2026-02-10
-        "%m/%d/%Y",          # 02/10/2026
-        "%m-%d-%Y",          # 02-10-2026
-        "%b %d, %Y",         # Feb 10, 2026
-        "%B %d, %Y",         # February 10, 2026
-        "%d %b %Y",          # 10 Feb 2026
-        "%d %B %Y",          # 10 February 2026
-    ]
-    for fmt in date_formats:
-        try:
-            parsed = datetime.strptime(posted_date.strip(), fmt)
-            return parsed >= cutoff
-        except ValueError:
-            continue
 
-    # Can't parse — exclude to be safe
-    return False
+def hedge_threshold(board: JobBoard) -> Optional[float]:
+    """
+    Seconds after which a run for board gets a backup run, or None if the
+    board doesn't hedge. Uses the board's "hedge_after" if set, otherwise
+    its historical latency percentile once there is enough history.
+    """
+    config = JOB_BOARD_CONFIGS[board]
+    if not HEDGE_ENABLED or not config.get("hedge"):
+        return None
+    if "hedge_after" in config:
+        return config["hedge_after"]
+    if board_stats.samples(board) < HEDGE_MIN_SAMPLES:
+        return None
+    return board_stats.percentile(board, config.get("hedge_percentile", HEDGE_PERCENTILE))
 
 
-async def search_single_board(
+def start_hedge(
     board: JobBoard,
-    keywords: str,
-    location: str,
+    url: str,
+    timeout_ms: int,
+    retry_budget: Optional[RetryBudget],
+) -> Optional[AsyncGenerator[dict, None]]:
+    """Start a backup agent run if the hedge budget and a free slot allow it."""
+    if not hedge_budget.allows_hedge() or not agent_limiter.has_free_slot(board):
+        return None
+    hedge_budget.record_hedge()
+    return hedge_run(board, url, timeout_ms, retry_budget)
+
+
+async def hedge_run(
+    board: JobBoard,
+    url: str,
+    timeout_ms: int,
+    retry_budget: Optional[RetryBudget],
 ) -> AsyncGenerator[dict, None]:
+    """A backup agent run, holding its own limiter slot while it runs."""
+    ticket = agent_limiter.try_acquire(board)
+    if ticket is None:
+        return
+    try:
+        async for event in run_tinyfish_agent(
+            url, JOB_BOARD_CONFIGS[board]["goal"], timeout=timeout_ms, retry_budget=retry_budget
+        ):
+            yield event
+    finally:
+        agent_limiter.release(ticket)
+
+
+def normalize_jobs(board: JobBoard, jobs: List[dict], now: Optional[float] = None) -> List[dict]:
     """
-    Search a single job board and yield status updates.
+    Turn raw agent job dicts into JobResult-shaped dicts tagged with their
+    source. posted_date is parsed into posted_at, an epoch timestamp (None
+    if unparseable), with relative dates counted back from `now` (default:
+    the current time), so they don't drift while the jobs sit in the cache.
     """
-    config = JOB_BOARD_CONFIGS.get(board)
-    if not config:
-        yield {
+    now = time.time() if now is None else now
+    return [
+        {
+            "title": job.get("title", "Unknown"),
+            "company": job.get("company", "Unknown"),
+            "location": job.get("location", "Unknown"),
+            "salary": job.get("salary"),
+            "url": job.get("url", ""),
+            "source": board.value,
+            "posted_date": job.get("posted_date"),
+            "posted_at": parse_posted_date(job.get("posted_date"), now),
+        }
+        for job in jobs
+    ]
+
+
+def record_run(board: JobBoard, started: float, outcome: str, jobs: int = 0) -> None:
+    """Feed a finished agent run to the adaptive limiter, board stats and breaker."""
+    latency = time.monotonic() - started
+    if adaptive_limit is not None:
+        adaptive_limit.on_result(board, latency, outcome)
+    board_stats.record(board, latency, outcome, jobs)
+    if outcome == OUTCOME_OK:
+        board_breakers[board].record_success()
+    else:
+        board_breakers[board].record_failure()
+
+
+def flight_key(url: str, timeout: Optional[float] = None) -> str:
+    """
+    Key of the shared agent run for a board search URL. Runs with a
+    client-chosen timeout aren't shared with searches that didn't ask for it.
+    """
+    return url if timeout is None else f"{url} timeout={timeout:g}"
+
+
+def breaker_allows(board: JobBoard, timeout: Optional[float] = None) -> bool:
+    """
+    Whether a new run may start for board. Runs with a client-chosen timeout
+    don't report to the breaker, so they can't be its half-open probe and
+    only start while it is closed.
+    """
+    breaker = board_breakers[board]
+    return breaker.state == CLOSED if timeout is not None else breaker.allow()
+
+
+async def renew_run_lock(url: str) -> None:
+    """Keep this worker's shared lock on url from expiring while its run goes on."""
+    while True:
+        await asyncio.sleep(WORKER_LOCK_RENEW_INTERVAL)
+        if not await result_cache.renew_run_lock(url, WORKER_LOCK_TTL):
+            return
+
+
+def failure_update(board: JobBoard, failure: dict) -> dict:
+    """The update for a board search answered by its failure record."""
+    if failure["kind"] == "empty":
+        return {
             "board": board.value,
-            "status": AgentStatus.ERROR.value,
-            "message": f"Unknown job board: {board.value}",
-            "error": f"Unknown job board: {board.value}",
+            "status": AgentStatus.COMPLETED.value,
+            "message": "Found 0 jobs (cached)",
+            "jobs": [],
+            "cached": True,
         }
-        return
-    
-    url = build_search_url(board, keywords, location)
-    
-    # Send initial status
-    yield {
+    return {
         "board": board.value,
-        "status": AgentStatus.RUNNING.value,
-        "message": f"Connecting to {config['name']}...",
+        "status": AgentStatus.ERROR.value,
+        "message": f"Recently failed, retrying in {int(failure['retry_in'])}s: {failure['message']}",
+        "error": failure["message"],
+        "cached": True,
     }
-    
+
+
+def error_update(board: JobBoard, error: Exception) -> dict:
+    """The final update for a board search that raised `error`."""
+    return {
+        "board": board.value,
+        "status": AgentStatus.ERROR.value,
+        "message": str(error),
+        "error": str(error),
+    }
+
+
+async def run_board(
+    board: JobBoard,
+    url: str,
+    retry_budget: Optional[RetryBudget] = None,
+    timeout: Optional[float] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Run the TinyFish agent for one board search URL (see run_agent) and
+    yield status updates.
+
+    With a shared cache backend, only one worker runs a given URL at a time;
+    the others wait for its result to appear in the shared cache. The lock
+    is renewed for as long as the run (queueing, retries and rate-limit
+    waits included) goes on. Once a worker gets the lock it checks the
+    shared cache and failure record again, in case the previous holder
+    just finished or failed the same search.
+    """
+    waiting_since = time.time()
+    notified = False
+    while not await result_cache.acquire_run_lock(url, WORKER_LOCK_TTL):
+        if not notified:
+            notified = True
+            yield {
+                "board": board.value,
+                "status": AgentStatus.RUNNING.value,
+                "message": "Same search running on another worker, waiting for its results...",
+            }
+        await asyncio.sleep(WORKER_LOCK_POLL_INTERVAL)
+
+        jobs = await result_cache.get_shared_since(url, waiting_since)
+        if jobs is not None:
+            yield {
+                "board": board.value,
+                "status": AgentStatus.COMPLETED.value,
+                "message": f"Found {len(jobs)} jobs (from another worker)",
+                "jobs": jobs,
+            }
+            return
+
+    renewal = asyncio.create_task(renew_run_lock(url))
+    try:
+        jobs = await result_cache.get_shared_since(url, waiting_since)
+        if jobs is not None:
+            yield {
+                "board": board.value,
+                "status": AgentStatus.COMPLETED.value,
+                "message": f"Found {len(jobs)} jobs (from another worker)",
+                "jobs": jobs,
+            }
+            return
+
+        failure = await result_cache.get_failure(url)
+        if failure is not None:
+            yield failure_update(board, failure)
+            return
+
+        async for update in run_agent(board, url, retry_budget, timeout):
+            yield update
+    finally:
+        renewal.cancel()
+        await result_cache.release_run_lock(url)
+
+
+async def run_agent(
+    board: JobBoard,
+    url: str,
+    retry_budget: Optional[RetryBudget] = None,
+    timeout: Optional[float] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Run the TinyFish agent for one board search URL and yield status updates.
+    Successful results are stored in the result cache.
+
+    The run waits for a slot from agent_limiter first, reporting its queue
+    position as a pending update.
+
+    The agent gets the board's learned timeout unless timeout (seconds)
+    overrides it. Such a run says little about the board's health, so it is
+    kept out of board stats, the adaptive limit, the circuit breaker and
+    the negative cache; only jobs it finds are cached. Transient TinyFish
+    failures are retried, spending from retry_budget.
+    On boards that hedge, a run slower than usual gets a backup run and
+    whichever completes first wins.
+    """
+    config = JOB_BOARD_CONFIGS[board]
+    # Whether this run's outcome may feed the stats, breaker and negative cache
+    report = timeout is None
+
+    ticket = agent_limiter.enqueue(board)
     try:
+        # Wait for a free agent slot, telling the client where it is in line
+        reported_position = None
+        while not ticket.granted:
+            if ticket.position != reported_position:
+                reported_position = ticket.position
+                yield {
+                    "board": board.value,
+                    "status": AgentStatus.PENDING.value,
+                    "message": f"Queued (position {ticket.position})",
+                }
+            await ticket.wait_for_change()
+        started = time.monotonic()
+
+        # Send initial status
+        yield {
+            "board": board.value,
+            "status": AgentStatus.RUNNING.value,
+            "message": f"Connecting to {config['name']}...",
+        }
+
         streaming_url = None
         final_jobs = []
         
-        async for event in run_tinyfish_agent(url, config["goal"]):
+        timeout_ms = int(learned_timeout(board_stats, board, config, timeout) * 1000)
+        events = run_tinyfish_agent(url, config["goal"], timeout=timeout_ms, retry_budget=retry_budget)
+        hedge_budget.record_run()
+        hedge_after = hedge_threshold(board)
+        if hedge_after is not None:
+            events = hedged_events(
+                events, lambda: start_hedge(board, url, timeout_ms, retry_budget), hedge_after, hedge_budget
+            )
+
+        async for event in events:
             # Handle streaming URL
             if "streamingUrl" in event:
                 streaming_url = event["streamingUrl"]
@@ -131,11 +403,17 @@ async def search_single_board(
             
             # Handle errors
             elif event.get("type") == "ERROR":
+                message = event.get("message", "Unknown error")
+                if report:
+                    record_run(board, started, OUTCOME_TIMEOUT if event.get("timeout") else OUTCOME_ERROR)
+                    await result_cache.set_failure(
+                        url, "error", message, config.get("error_ttl", NEGATIVE_CACHE_ERROR_TTL)
+                    )
                 yield {
                     "board": board.value,
                     "status": AgentStatus.ERROR.value,
-                    "message": event.get("message", "Unknown error"),
-                    "error": event.get("message", "Unknown error"),
+                    "message": message,
+                    "error": message,
                 }
                 return
             
@@ -150,27 +428,22 @@ async def search_single_board(
                     except json.JSONDecodeError:
                         result = {"jobs": []}
                 
-                jobs = result.get("jobs", [])
-                
-                # Add source to each job
-                all_jobs = [
-                    {
-                        "title": job.get("title", "Unknown"),
-                        "company": job.get("company", "Unknown"),
-                        "location": job.get("location", "Unknown"),
-                        "salary": job.get("salary"),
-                        "url": job.get("url", ""),
-                        "source": board.value,
-                        "posted_date": job.get("posted_date"),
-                    }
-                    for job in jobs
-                ]
+                # Add source and posted_at to each job
+                now = time.time()
+                all_jobs = normalize_jobs(board, result.get("jobs", []), now)
 
                 # Filter to only jobs posted within the last 72 hours
-                final_jobs = [
-                    job for job in all_jobs
-                    if is_within_max_age(job.get("posted_date"))
-                ]
+                final_jobs = filter_recent_jobs(all_jobs, now)
+
+                if report:
+                    record_run(board, started, OUTCOME_OK, len(final_jobs))
+
+                if all_jobs:
+                    await result_cache.set(url, final_jobs)
+                elif report:
+                    await result_cache.set_failure(
+                        url, "empty", "No jobs found", config.get("empty_ttl", NEGATIVE_CACHE_EMPTY_TTL)
+                    )
 
                 yield {
                     "board": board.value,
@@ -180,49 +453,407 @@ async def search_single_board(
                 }
     
     except Exception as e:
+        if report:
+            if ticket.granted:
+                record_run(board, started, OUTCOME_ERROR)
+            await result_cache.set_failure(
+                url, "error", str(e), config.get("error_ttl", NEGATIVE_CACHE_ERROR_TTL)
+            )
+        yield error_update(board, e)
+
+    finally:
+        agent_limiter.release(ticket)
+
+
+async def search_single_board(
+    board: JobBoard,
+    keywords: str,
+    location: str,
+    allow_stale: bool = True,
+    retry_budget: Optional[RetryBudget] = None,
+    timeout: Optional[float] = None,
+    skip_reason: Optional[str] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Search a single job board and yield status updates.
+
+    The query is canonicalized and planned into a board search URL, which
+    is also the key for the result cache and for sharing agent runs. For
+    boards that ignore the location, results are filtered to it locally.
+    """
+    config = JOB_BOARD_CONFIGS.get(board)
+    if not config:
         yield {
             "board": board.value,
             "status": AgentStatus.ERROR.value,
-            "message": str(e),
-            "error": str(e),
+            "message": f"Unknown job board: {board.value}",
+            "error": f"Unknown job board: {board.value}",
         }
+        return
+    
+    # Equivalent spellings of a query share one URL, cache entry and run
+    typed_location = " ".join(location.split())
+    keywords, location = canonicalize_query(keywords, location)
+    url = build_search_url(board, keywords, location)
+    cache_warmer.record(board, url)
+
+    # Boards whose URL ignores the location share one run across every
+    # location; narrow their results down to the requested one here
+    location_filter = None if board_uses_location(board) else location
+
+    async for update in board_updates(board, url, allow_stale, retry_budget, timeout, skip_reason):
+        if location_filter and update.get("jobs") is not None:
+            update = filter_update_by_location(update, location_filter, typed_location)
+        yield update
+
+
+def board_search_url(board: JobBoard, keywords: str, location: str) -> str:
+    """The canonical search URL of a board query, as used by search_single_board."""
+    keywords, location = canonicalize_query(keywords, location)
+    return build_search_url(board, keywords, location)
+
+
+def filter_update_by_location(update: dict, location: str, display_location: Optional[str] = None) -> dict:
+    """
+    Return a copy of a COMPLETED update with only the jobs in location (a
+    canonical location). The message names display_location, the location
+    as the user typed it, if given.
+    """
+    jobs = update["jobs"]
+    matching = [job for job in jobs if location_matches(job.get("location"), location)]
+    return {
+        **update,
+        "jobs": matching,
+        "message": update.get("message", "").replace(
+            f"Found {len(jobs)} jobs", f"Found {len(matching)} jobs in {display_location or location}", 1
+        ),
+    }
 
 
-async def search_all_boards(request: SearchRequest) -> AsyncGenerator[str, None]:
+async def board_updates(
+    board: JobBoard,
+    url: str,
+    allow_stale: bool = True,
+    retry_budget: Optional[RetryBudget] = None,
+    timeout: Optional[float] = None,
+    skip_reason: Optional[str] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Yield the updates for one board search URL.
+
+    Results come from the result cache when possible, and searches that
+    recently failed or came back empty fail fast. Otherwise concurrent
+    searches for the same board URL share a single agent run.
+
+    With allow_stale, an expired cached result is sent right away (marked
+    stale, with its age) while the board is refreshed in the background;
+    the refreshed COMPLETED update follows if the client is still there.
+
+    While the board's circuit breaker is open, or if the search planner
+    gave a skip_reason, no new agent run is started: the stale result is
+    sent if there is one, otherwise the board fails fast.
+
+    A shared run uses the retry_budget of the search that started it. Runs
+    with a timeout override are only shared by searches with the same one.
+    """
+    # Replay a recent run for the same search URL instead of starting an agent
+    cached = await result_cache.get_stale(url)
+    if cached is not None:
+        cached_jobs, age = cached
+        # Jobs were recent when stored; drop the ones that have aged out since
+        now = time.time()
+        cached_jobs = filter_recent_jobs(cached_jobs, now, stored_at=now - age)
+        cached = cached_jobs, age
+        if age < result_cache.ttl:
+            yield {
+                "board": board.value,
+                "status": AgentStatus.COMPLETED.value,
+                "message": f"Found {len(cached_jobs)} jobs (cached)",
+                "jobs": cached_jobs,
+                "cached": True,
+            }
+            return
+
+    # Fail fast if this search recently failed or came back empty. A stale
+    # result, if any, is still better than nothing.
+    failure = await result_cache.get_failure(url)
+    if failure is not None:
+        if cached is not None and allow_stale:
+            cached_jobs, age = cached
+            yield {
+                "board": board.value,
+                "status": AgentStatus.COMPLETED.value,
+                "message": f"Found {len(cached_jobs)} jobs (from {int(age // 60)}m ago)",
+                "jobs": cached_jobs,
+                "cached": True,
+                "stale": True,
+                "age_seconds": int(age),
+            }
+        else:
+            yield failure_update(board, failure)
+        return
+
+    # Joining a run that is already going costs nothing, so only new runs
+    # need the breaker's permission
+    key = flight_key(url, timeout)
+    if skip_reason is not None or (key not in board_flights and not breaker_allows(board, timeout)):
+        if cached is not None and allow_stale:
+            cached_jobs, age = cached
+            yield {
+                "board": board.value,
+                "status": AgentStatus.COMPLETED.value,
+                "message": f"Found {len(cached_jobs)} jobs (from {int(age // 60)}m ago)",
+                "jobs": cached_jobs,
+                "cached": True,
+                "stale": True,
+                "age_seconds": int(age),
+            }
+        elif skip_reason is not None:
+            yield {
+                "board": board.value,
+                "status": AgentStatus.ERROR.value,
+                "message": f"Skipped: {skip_reason}",
+                "error": skip_reason,
+                "skipped": True,
+            }
+        else:
+            message = f"{JOB_BOARD_CONFIGS[board]['name']} is temporarily unavailable"
+            yield {
+                "board": board.value,
+                "status": AgentStatus.ERROR.value,
+                "message": f"{message}, retrying in {int(board_breakers[board].retry_in())}s",
+                "error": message,
+            }
+        return
+
+    if cached is not None and allow_stale:
+        cached_jobs, age = cached
+        yield {
+            "board": board.value,
+            "status": AgentStatus.COMPLETED.value,
+            "message": f"Found {len(cached_jobs)} jobs (from {int(age // 60)}m ago, refreshing...)",
+            "jobs": cached_jobs,
+            "cached": True,
+            "stale": True,
+            "age_seconds": int(age),
+        }
+
+        # Refresh in the background. Only the new result is forwarded so
+        # the board doesn't drop back to "running" on the client; if the
+        # refresh fails the stale result stands.
+        async for update in board_flights.subscribe(
+            key, lambda: run_board(board, url, retry_budget, timeout), keep_running=True,
+            on_error=lambda e: error_update(board, e),
+        ):
+            if update["status"] == AgentStatus.COMPLETED.value:
+                yield update
+        return
+
+    async for update in board_flights.subscribe(
+        key, lambda: run_board(board, url, retry_budget, timeout), on_error=lambda e: error_update(board, e)
+    ):
+        yield update
+
+
+async def should_warm(url: str) -> bool:
+    """Whether a popular board URL needs a warm-up run before it goes stale."""
+    if url in board_flights or await result_cache.get_failure(url) is not None:
+        return False
+
+    cached = await result_cache.get_stale(url)
+    return cached is None or cached[1] >= result_cache.ttl - CACHE_WARM_AHEAD
+
+
+async def warm_board(board: JobBoard, url: str) -> None:
+    """Run a board search in the background just to refresh the cache."""
+    if board_breakers[board].state != CLOSED:
+        return
+    async for _ in board_flights.subscribe(
+        url, lambda: run_board(board, url), keep_running=True, on_error=lambda e: error_update(board, e)
+    ):
+        pass
+
+
+# Re-runs popular board searches before they expire (see CACHE_WARM_*)
+cache_warmer = CacheWarmer(should_warm, warm_board)
+
+
+async def plan_search(request: SearchRequest) -> List[dict]:
+    """
+    Plan each requested board against the search's latency budget
+    (deadline_seconds) from run history, cache state and breaker state,
+    without running anything. Plans come back in start order.
+    """
+    plans = []
+    for board in request.job_boards:
+        url = board_search_url(board, request.keywords, request.location)
+        cached = await result_cache.get_stale(url)
+        failure = await result_cache.get_failure(url)
+        plans.append(plan_board(
+            board,
+            board_stats,
+            request.deadline_seconds,
+            cache_age=None if cached is None else cached[1],
+            fresh_ttl=result_cache.ttl,
+            recently_failed=failure is not None,
+            breaker_open=board_breakers[board].state == OPEN,
+            allow_stale=request.allow_stale,
+        ))
+    return order_plans(plans)
+
+
+async def search_all_boards(
+    request: SearchRequest,
+    http_request: Optional[Request] = None,
+) -> AsyncGenerator[str, None]:
     """
     Search all selected job boards in parallel and stream results as SSE.
     Yields pre-formatted SSE strings (data: ...\n\n) for use with StreamingResponse.
+
+    If http_request is given, the client connection is checked every
+    HEARTBEAT_INTERVAL seconds and all board runs are cancelled as soon as
+    it goes away. Idle periods are filled with SSE heartbeat comments so a
+    dead connection also surfaces as a failed send.
+
+    With request.deadline_seconds, boards are planned first (see
+    plan_search): likely-fast boards start first and boards that can't
+    finish in time are served stale or skipped. The stream ends once the
+    deadline passes:
+    boards without results yet are reported as timed out, and their runs
+    either finish in the background to fill the cache
+    (request.finish_in_background) or are cancelled.
     """
     # Send initial pending status for all boards
     for board in request.job_boards:
         yield f"data: {json.dumps({'board': board.value, 'status': 'pending', 'message': 'Queued...'})}\n\n"
 
-    # Create async tasks for each board
-    async def process_board(board: JobBoard) -> list:
-        """Process a single board and collect all updates."""
-        updates = []
-        async for update in search_single_board(board, request.keywords, request.location):
-            updates.append(update)
-        return updates
+    # Fan every board's updates into one bounded queue so each event is
+    # forwarded the moment it arrives instead of when its board finishes.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+
+    # Retries of transient TinyFish failures allowed across all boards
+    retry_budget = RetryBudget()
 
-    # Run all boards in parallel using asyncio.gather
-    tasks = [process_board(board) for board in request.job_boards]
+    # With a deadline, start the boards most likely to deliver in time first
+    # and don't start runs that historically can't finish within it
+    boards = list(request.job_boards)
+    skip_reasons = {}
+    if request.deadline_seconds is not None:
+        plans = await plan_search(request)
+        boards = [JobBoard(plan["board"]) for plan in plans]
+        skip_reasons = {
+            JobBoard(plan["board"]): plan["reason"]
+            for plan in plans if plan["action"] in (ACTION_STALE, ACTION_SKIP)
+        }
 
-    # Use as_completed to stream results as they finish
-    for coro in asyncio.as_completed(tasks):
+    async def pump_board(board: JobBoard) -> None:
+        """Forward a single board's updates into the shared queue."""
         try:
-            updates = await coro
-            for update in updates:
-                yield f"data: {json.dumps(update)}\n\n"
+            async for update in search_single_board(
+                board, request.keywords, request.location,
+                request.allow_stale, retry_budget, request.timeout_seconds,
+                skip_reasons.get(board),
+            ):
+                await queue.put(update)
         except Exception as e:
-            # If a task fails, send error for that board
-            yield f"data: {json.dumps({'status': 'error', 'error': str(e)})}\n\n"
+            # If a board fails outside its own error handling, report it
+            await queue.put(error_update(board, e))
+        await queue.put(_BOARD_DONE)
+
+    tasks = [asyncio.create_task(pump_board(board)) for board in boards]
+
+    loop = asyncio.get_running_loop()
+    last_check = loop.time()
+    deadline = None if request.deadline_seconds is None else last_check + request.deadline_seconds
+    completed = set()
+
+    try:
+        remaining = len(tasks)
+        while remaining:
+            timeout = HEARTBEAT_INTERVAL
+            if deadline is not None:
+                timeout = min(timeout, deadline - loop.time())
+                if timeout <= 0:
+                    async for event in deadline_updates(request, boards, queue, tasks, completed):
+                        yield event
+                    break
+
+            try:
+                update = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                update = None
+
+            if http_request is not None and (
+                update is None or loop.time() - last_check >= HEARTBEAT_INTERVAL
+            ):
+                last_check = loop.time()
+                if await http_request.is_disconnected():
+                    return
+
+            if update is None:
+                if deadline is None or loop.time() < deadline:
+                    yield ": heartbeat\n\n"
+                continue
+            if update is _BOARD_DONE:
+                remaining -= 1
+                continue
+            if update["status"] == AgentStatus.COMPLETED.value:
+                completed.add(update["board"])
+            yield f"data: {json.dumps(update)}\n\n"
+    finally:
+        # Stop every board run (and its upstream TinyFish stream) if the
+        # client went away or the stream was closed early
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     yield "data: [DONE]\n\n"
 
 
+async def deadline_updates(
+    request: SearchRequest,
+    boards: List[JobBoard],
+    queue: asyncio.Queue,
+    tasks: List[asyncio.Task],
+    completed: Set[str],
+) -> AsyncGenerator[str, None]:
+    """
+    Wrap up a search whose deadline has passed: forward the updates already
+    queued, then report every board that hasn't produced results as timed
+    out. With request.finish_in_background, those boards' runs are detached
+    so they still complete and fill the cache.
+    """
+    while not queue.empty():
+        update = queue.get_nowait()
+        if update is _BOARD_DONE:
+            continue
+        if update["status"] == AgentStatus.COMPLETED.value:
+            completed.add(update["board"])
+        yield f"data: {json.dumps(update)}\n\n"
+
+    message = f"No results within the {request.deadline_seconds:g}s search deadline"
+    if request.finish_in_background:
+        message += ", finishing in the background"
+
+    for board, task in zip(boards, tasks):
+        if task.done() or board.value in completed:
+            continue
+        if request.finish_in_background and board in JOB_BOARD_CONFIGS:
+            board_flights.detach(flight_key(
+                board_search_url(board, request.keywords, request.location), request.timeout_seconds
+            ))
+        update = {
+            "board": board.value,
+            "status": AgentStatus.ERROR.value,
+            "message": message,
+            "error": message,
+            "timed_out": True,
+        }
+        yield f"data: {json.dumps(update)}\n\n"
+
+
 @router.post("/search")
-async def search_jobs(request: SearchRequest):
+async def search_jobs(request: SearchRequest, http_request: Request):
     """
     Start a job search across selected job boards.
     Returns an SSE stream with real-time updates.
@@ -231,15 +862,19 @@ async def search_jobs(request: SearchRequest):
     - keywords: Job title or keywords (e.g., "AI Engineer")
     - location: Location (e.g., "San Francisco" or "Remote")
     - job_boards: List of job boards to search
+    - deadline_seconds (optional): End the stream after this long with
+      whatever has finished
     
     SSE Events:
     - {"board": "linkedin", "status": "pending", "message": "Queued..."}
     - {"board": "linkedin", "status": "running", "streaming_url": "...", "message": "..."}
     - {"board": "linkedin", "status": "completed", "jobs": [...]}
     - {"board": "linkedin", "status": "error", "error": "..."}
+    - {"board": "linkedin", "status": "error", "timed_out": true, ...} past the deadline
+    - ": heartbeat" comments while no board has anything to report
     """
     return StreamingResponse(
-        search_all_boards(request),
+        search_all_boards(request, http_request),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -249,6 +884,55 @@ async def search_jobs(request: SearchRequest):
     )
 
 
+@router.post("/search/plan")
+async def search_plan(request: SearchRequest):
+    """
+    Predict how a search would go without running it: per board, the
+    predicted latency, cache freshness, expected job count and whether it
+    would be answered from cache, run, served stale or skipped within
+    deadline_seconds.
+    """
+    return {
+        "budget_seconds": request.deadline_seconds,
+        "boards": await plan_search(request),
+    }
+
+
+@router.get("/status")
+async def status():
+    """
+    Live metrics: agent concurrency limit and queue depth, TinyFish rate
+    limit, per-board run stats and timeouts, circuit breaker states, hedged
+    runs, in-flight runs and cache sizes.
+    """
+    boards = board_stats.snapshot()
+    for board in JOB_BOARD_CONFIGS:
+        if board.value in boards:
+            boards[board.value]["timeout_seconds"] = learned_timeout(
+                board_stats, board, JOB_BOARD_CONFIGS[board]
+            )
+
+    return {
+        "limiter": {
+            "limit": agent_limiter.limit,
+            "active": agent_limiter.active,
+            "queue_depth": agent_limiter.queue_depth,
+            "adaptive": adaptive_limit.snapshot() if adaptive_limit is not None else None,
+        },
+        "boards": boards,
+        "rate_limit": rate_limiter.snapshot(),
+        "breakers": board_breakers.snapshot(),
+        "hedging": hedge_budget.snapshot(),
+        "in_flight": len(board_flights),
+        "cache": {
+            "entries": len(result_cache.local),
+            "bytes": result_cache.local.size_bytes,
+            "failures": len(result_cache.failures),
+        },
+        "posted_dates": posted_date_cache_info(),
+    }
+
+
 @router.get("/boards")
 async def list_boards():
     """
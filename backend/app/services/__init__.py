@@ -1,9 +1,73 @@
-from .tinyfish import run_tinyfish_agent
-from .job_boards import JOB_BOARD_CONFIGS, get_board_config, build_search_url
+from .tinyfish import run_tinyfish_agent, start_client, close_client, get_client
+from .cache import ResultCache, NegativeCache, TieredResultCache
+from .cache_backends import (
+    CacheBackend,
+    SQLiteCacheBackend,
+    RedisCacheBackend,
+    open_shared_cache,
+    close_shared_cache,
+    get_shared_cache,
+)
+from .singleflight import SingleFlight
+from .query import canonicalize_query, canonicalize_keywords, canonicalize_location, location_matches
+from .warmer import QueryPopularity, CacheWarmer
+from .limiter import ConcurrencyLimiter, Ticket, AdaptiveLimit
+from .board_stats import BoardStats
+from .retry import RetryBudget
+from .hedging import HedgeBudget, hedged_events
+from .breaker import CircuitBreaker, BoardBreakers
+from .timeouts import learned_timeout
+from .planner import plan_board, order_plans
+from .rate_limit import TokenBucket
+from .cassettes import CassetteStore, RecordingTransport, ReplayTransport
+from .job_boards import (
+    JOB_BOARD_CONFIGS,
+    get_board_config,
+    get_template_params,
+    board_uses_location,
+    build_search_url,
+)
 
 __all__ = [
     "run_tinyfish_agent",
+    "start_client",
+    "close_client",
+    "get_client",
+    "ResultCache",
+    "NegativeCache",
+    "TieredResultCache",
+    "CacheBackend",
+    "SQLiteCacheBackend",
+    "RedisCacheBackend",
+    "open_shared_cache",
+    "close_shared_cache",
+    "get_shared_cache",
+    "SingleFlight",
+    "canonicalize_query",
+    "canonicalize_keywords",
+    "canonicalize_location",
+    "location_matches",
+    "QueryPopularity",
+    "CacheWarmer",
+    "ConcurrencyLimiter",
+    "Ticket",
+    "AdaptiveLimit",
+    "BoardStats",
+    "RetryBudget",
+    "HedgeBudget",
+    "hedged_events",
+    "CircuitBreaker",
+    "BoardBreakers",
+    "learned_timeout",
+    "plan_board",
+    "order_plans",
+    "TokenBucket",
+    "CassetteStore",
+    "RecordingTransport",
+    "ReplayTransport",
     "JOB_BOARD_CONFIGS",
     "get_board_config",
+    "get_template_params",
+    "board_uses_location",
     "build_search_url",
 ]
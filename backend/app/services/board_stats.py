@@ -0,0 +1,75 @@
+import math
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.models.schemas import JobBoard
+
+# Number of recent runs kept per board
+BOARD_STATS_WINDOW = int(os.getenv("BOARD_STATS_WINDOW", "200"))
+
+# Outcomes of an agent run
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+OUTCOME_TIMEOUT = "timeout"
+
+
+class BoardStats:
+    """
+    Rolling history of recent agent runs per board: how long they took,
+    how they ended and how many jobs they returned.
+    """
+
+    def __init__(self, window: int = BOARD_STATS_WINDOW):
+        self.window = window
+        # board -> recent (latency seconds, outcome, job count)
+        self._runs: Dict[JobBoard, Deque[Tuple[float, str, int]]] = {}
+
+    def record(self, board: JobBoard, latency: float, outcome: str, jobs: int = 0) -> None:
+        runs = self._runs.setdefault(board, deque(maxlen=self.window))
+        runs.append((latency, outcome, jobs))
+
+    def samples(self, board: JobBoard) -> int:
+        return len(self._runs.get(board, ()))
+
+    def latencies(self, board: JobBoard, successful_only: bool = True) -> List[float]:
+        return [
+            latency for latency, outcome, _ in self._runs.get(board, ())
+            if outcome == OUTCOME_OK or not successful_only
+        ]
+
+    def percentile(self, board: JobBoard, q: float) -> Optional[float]:
+        """Latency percentile q (0-100) of successful runs, or None without data."""
+        values = sorted(self.latencies(board))
+        if not values:
+            return None
+        index = max(0, math.ceil(q / 100 * len(values)) - 1)
+        return values[index]
+
+    def error_rate(self, board: JobBoard) -> float:
+        """Share of recent runs that failed or timed out."""
+        runs = self._runs.get(board)
+        if not runs:
+            return 0.0
+        return sum(1 for _, outcome, _ in runs if outcome != OUTCOME_OK) / len(runs)
+
+    def mean_jobs(self, board: JobBoard) -> Optional[float]:
+        """Average job count of successful runs, or None without data."""
+        counts = [jobs for _, outcome, jobs in self._runs.get(board, ()) if outcome == OUTCOME_OK]
+        if not counts:
+            return None
+        return sum(counts) / len(counts)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Summary per board for the status endpoint."""
+        return {
+            board.value: {
+                "samples": self.samples(board),
+                "p50_seconds": self.percentile(board, 50),
+                "p90_seconds": self.percentile(board, 90),
+                "p99_seconds": self.percentile(board, 99),
+                "error_rate": round(self.error_rate(board), 3),
+                "mean_jobs": self.mean_jobs(board),
+            }
+            for board in self._runs
+        }
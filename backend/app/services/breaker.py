@@ -0,0 +1,104 @@
+import os
+import time
+from typing import Dict, Optional
+
+from app.models.schemas import JobBoard
+
+# Per-board circuit breaker settings, overridable via environment
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "60"))
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops starting agent runs for a board that keeps failing.
+
+    After `threshold` consecutive errors or timeouts the breaker opens and
+    new runs are refused. Once `reset_timeout` seconds have passed it is
+    half-open: a single probe run is let through, and its outcome closes
+    the breaker again or re-opens it. A probe that never reports back
+    (e.g. cancelled while queued) is given up on after probe_timeout.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        probe_timeout: Optional[float] = None,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout if probe_timeout is not None else reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a probe through (0 if it would now)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a new run may start. In half-open state this claims the probe."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+
+        now = time.monotonic()
+        if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+            return False
+        self._probe_started = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.threshold:
+            # A failed probe (or a run started before the breaker opened)
+            # restarts the open period
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in_seconds": round(self.retry_in(), 1),
+        }
+
+
+class BoardBreakers:
+    """One CircuitBreaker per job board, created on first use."""
+
+    def __init__(self, **breaker_kwargs):
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[JobBoard, CircuitBreaker] = {}
+
+    def __getitem__(self, board: JobBoard) -> CircuitBreaker:
+        breaker = self._breakers.get(board)
+        if breaker is None:
+            breaker = self._breakers[board] = CircuitBreaker(**self._breaker_kwargs)
+        return breaker
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {board.value: breaker.snapshot() for board, breaker in self._breakers.items()}
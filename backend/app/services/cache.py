@@ -0,0 +1,329 @@
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.cache_backends import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the per-board result cache, overridable via environment
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "900"))
+RESULT_CACHE_STALE_TTL = float(os.getenv("RESULT_CACHE_STALE_TTL", str(6 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Default TTLs for remembering failed and empty board runs; boards can
+# override them with "error_ttl" / "empty_ttl" in JOB_BOARD_CONFIGS
+NEGATIVE_CACHE_ERROR_TTL = float(os.getenv("NEGATIVE_CACHE_ERROR_TTL", "120"))
+NEGATIVE_CACHE_EMPTY_TTL = float(os.getenv("NEGATIVE_CACHE_EMPTY_TTL", "300"))
+
+# Key prefix for failure records in the shared cache backend
+_FAILURE_PREFIX = "failed:"
+
+
+class ResultCache:
+    """
+    In-process TTL + LRU cache for normalized per-board job lists.
+
+    Entries are fresh for `ttl` seconds after they are stored. After that
+    they can still be served as stale (see get_stale) until they are
+    `stale_ttl` seconds old, and are then dropped. When the cache holds more
+    than `max_entries` entries or more than `max_bytes` of (JSON-encoded)
+    jobs, the least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESULT_CACHE_TTL,
+        stale_ttl: float = RESULT_CACHE_STALE_TTL,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (stored_at, size, jobs)
+        self._entries: "OrderedDict[str, Tuple[float, int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached jobs for key, or None if missing or not fresh."""
+        entry = self.get_stale(key)
+        if entry is None:
+            return None
+
+        jobs, age = entry
+        return jobs if age < self.ttl else None
+
+    def get_stale(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """
+        Return (jobs, age in seconds) for key, fresh or stale, or None if
+        missing or too old to serve at all.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, _, jobs = entry
+        age = time.monotonic() - stored_at
+        if age >= self.stale_ttl:
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return jobs, age
+
+    def set(self, key: str, jobs: List[Dict[str, Any]], age: float = 0.0) -> None:
+        """
+        Store jobs for key, evicting least recently used entries if needed.
+        age backdates the entry, e.g. when copying it from another cache.
+        """
+        size = len(json.dumps(jobs))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() - age, size, jobs)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class NegativeCache:
+    """
+    Short-lived records of failed or empty board runs, kept apart from
+    successful results. Each record has its own TTL; past `max_entries`
+    the least recently used records are dropped.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # key -> (expires_at, kind, message)
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return {"kind", "message", "retry_in"} for key, or None. kind is
+        "error" or "empty"; retry_in is the seconds until the record expires.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, kind, message = entry
+        retry_in = expires_at - time.monotonic()
+        if retry_in <= 0:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return {"kind": kind, "message": message, "retry_in": retry_in}
+
+    def set(self, key: str, kind: str, message: str, ttl: float) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + ttl, kind, message)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TieredResultCache:
+    """
+    The in-process ResultCache in front of the shared cache backend (if one
+    is configured), so results are reused across uvicorn workers.
+
+    Shared entries carry their wall-clock store time so the same freshness
+    and staleness limits apply on every worker. Shared cache failures are
+    logged and treated as misses.
+
+    Failed and empty runs are remembered separately (see NegativeCache),
+    with their own short TTLs.
+    """
+
+    def __init__(self, local: ResultCache, failures: Optional[NegativeCache] = None):
+        self.local = local
+        self.failures = failures or NegativeCache()
+        # key -> token of the shared run lock this worker holds
+        self._lock_tokens: Dict[str, str] = {}
+
+    @property
+    def ttl(self) -> float:
+        return self.local.ttl
+
+    async def get_stale(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Return (jobs, age in seconds) from the local or shared cache."""
+        entry = self.local.get_stale(key)
+        if entry is not None:
+            return entry
+
+        shared = get_shared_cache()
+        if shared is None:
+            return None
+
+        try:
+            value = await shared.get(key)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if value is None:
+            return None
+
+        age = max(0.0, time.time() - value["stored_at"])
+        if age >= self.local.stale_ttl:
+            return None
+
+        self.local.set(key, value["jobs"], age=age)
+        return value["jobs"], age
+
+    async def set(self, key: str, jobs: List[Dict[str, Any]]) -> None:
+        """Store jobs in the local cache and the shared cache."""
+        self.local.set(key, jobs)
+        self.failures.delete(key)
+
+        shared = get_shared_cache()
+        if shared is None:
+            return
+
+        try:
+            await shared.set(key, {"jobs": jobs, "stored_at": time.time()}, ttl=self.local.stale_ttl)
+            await shared.delete(_FAILURE_PREFIX + key)
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def get_failure(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the failure record for key from the local or shared cache."""
+        failure = self.failures.get(key)
+        if failure is not None:
+            return failure
+
+        shared = get_shared_cache()
+        if shared is None:
+            return None
+
+        try:
+            value = await shared.get(_FAILURE_PREFIX + key)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if value is None:
+            return None
+
+        retry_in = value["expires_at"] - time.time()
+        if retry_in <= 0:
+            return None
+
+        self.failures.set(key, value["kind"], value["message"], retry_in)
+        return {"kind": value["kind"], "message": value["message"], "retry_in": retry_in}
+
+    async def set_failure(self, key: str, kind: str, message: str, ttl: float) -> None:
+        """Remember a failed ("error") or empty ("empty") run for ttl seconds."""
+        self.failures.set(key, kind, message, ttl)
+
+        shared = get_shared_cache()
+        if shared is None:
+            return
+
+        try:
+            value = {"kind": kind, "message": message, "expires_at": time.time() + ttl}
+            await shared.set(_FAILURE_PREFIX + key, value, ttl=ttl)
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def get_shared_since(self, key: str, since: float) -> Optional[List[Dict[str, Any]]]:
+        """Return jobs another worker stored for key after `since` (epoch seconds)."""
+        shared = get_shared_cache()
+        if shared is None:
+            return None
+
+        try:
+            value = await shared.get(key)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if value is None or value["stored_at"] < since:
+            return None
+
+        self.local.set(key, value["jobs"], age=max(0.0, time.time() - value["stored_at"]))
+        return value["jobs"]
+
+    async def acquire_run_lock(self, key: str, ttl: float) -> bool:
+        """
+        Try to become the only worker running the search for key. Always
+        succeeds without a shared cache, or if the shared cache fails.
+        """
+        shared = get_shared_cache()
+        if shared is None:
+            return True
+
+        try:
+            token = await shared.acquire_lock(key, ttl)
+        except Exception as e:
+            logger.warning("Shared cache lock failed: %s", e)
+            return True
+        if token is None:
+            return False
+
+        self._lock_tokens[key] = token
+        return True
+
+    async def renew_run_lock(self, key: str, ttl: float) -> bool:
+        """
+        Keep holding the run lock for key for another `ttl` seconds.
+        Returns False if this worker doesn't hold it (any more).
+        """
+        token = self._lock_tokens.get(key)
+        shared = get_shared_cache()
+        if token is None or shared is None:
+            return False
+
+        try:
+            return await shared.extend_lock(key, token, ttl)
+        except Exception as e:
+            logger.warning("Shared cache lock renewal failed: %s", e)
+            return True
+
+    async def release_run_lock(self, key: str) -> None:
+        token = self._lock_tokens.pop(key, None)
+        shared = get_shared_cache()
+        if token is None or shared is None:
+            return
+
+        try:
+            await shared.release_lock(key, token)
+        except Exception as e:
+            logger.warning("Shared cache unlock failed: %s", e)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.failures.clear()
@@ -0,0 +1,395 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+# Shared (cross-worker) cache settings, overridable via environment.
+# RESULT_CACHE_BACKEND is "sqlite", "redis" or empty for no shared cache.
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "")
+RESULT_CACHE_URL = os.getenv("RESULT_CACHE_URL", "")
+SHARED_CACHE_MAX_BYTES = int(os.getenv("SHARED_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+class CacheBackend:
+    """
+    Interface for a cache shared by every uvicorn worker.
+
+    Values are JSON-serializable and expire `ttl` seconds after they are set.
+    Locks are named, expire after `ttl` seconds so a crashed holder can't
+    block others forever, and are released with the token acquire_lock
+    returned.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """Take the lock if it is free. Returns a release token, or None."""
+        raise NotImplementedError
+
+    async def release_lock(self, name: str, token: str) -> None:
+        raise NotImplementedError
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        """Make a lock we hold expire `ttl` seconds from now. Returns whether we still held it."""
+        raise NotImplementedError
+
+    async def take_token(self, name: str, rate: float, burst: float) -> float:
+        """
+        Take a token from the named token bucket (refilled at `rate` tokens
+        per second, holding at most `burst`). Returns 0 if one was taken,
+        otherwise the seconds until one is available.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Shared cache in an on-disk SQLite database in WAL mode, for workers on
+    the same host. When the stored values exceed max_bytes, the least
+    recently read entries are evicted.
+    """
+
+    def __init__(self, path: str = "result_cache.db", max_bytes: int = SHARED_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS locks ("
+            " name TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    def _get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        row = self._db.execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        data = json.dumps(value)
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now + ttl, now),
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total - self.max_bytes)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _evict(self, excess: int) -> None:
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if excess <= 0:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            excess -= size
+
+    def _delete(self, key: str) -> None:
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("DELETE FROM locks WHERE name = ? AND expires_at <= ?", (name, now))
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO locks (name, token, expires_at) VALUES (?, ?, ?)",
+                (name, token, now + ttl),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return token if cursor.rowcount == 1 else None
+
+    def _release_lock(self, name: str, token: str) -> None:
+        self._db.execute("DELETE FROM locks WHERE name = ? AND token = ?", (name, token))
+
+    def _extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        now = time.time()
+        cursor = self._db.execute(
+            "UPDATE locks SET expires_at = ? WHERE name = ? AND token = ? AND expires_at > ?",
+            (now + ttl, name, token, now),
+        )
+        return cursor.rowcount == 1
+
+    def _take_token(self, name: str, rate: float, burst: float) -> float:
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)
+            ).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._db.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (name, tokens, now),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return wait
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._run(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        return await self._run(self._acquire_lock, name, ttl)
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self._run(self._release_lock, name, token)
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        return await self._run(self._extend_lock, name, token, ttl)
+
+    async def take_token(self, name: str, rate: float, burst: float) -> float:
+        return await self._run(self._take_token, name, rate, burst)
+
+    async def close(self) -> None:
+        await self._run(self._db.close)
+
+
+class RedisProtocolError(Exception):
+    pass
+
+
+# Delete a lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+# Push a lock's expiry out only if it still holds our token
+_EXTEND_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+)
+
+
+# Token bucket on the server clock, so every worker sees the same bucket.
+# The wait is returned as a string because Lua numbers become integers.
+_TAKE_TOKEN_SCRIPT = (
+    "local t = redis.call('time') "
+    "local now = tonumber(t[1]) + tonumber(t[2]) / 1000000 "
+    "local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2]) "
+    "local state = redis.call('hmget', KEYS[1], 'tokens', 'updated_at') "
+    "local tokens = tonumber(state[1]) or burst "
+    "local updated_at = tonumber(state[2]) or now "
+    "tokens = math.min(burst, tokens + (now - updated_at) * rate) "
+    "local wait = 0 "
+    "if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end "
+    "redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now)) "
+    "redis.call('pexpire', KEYS[1], math.ceil(burst / rate * 1000) + 1000) "
+    "return tostring(wait)"
+)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache on any server speaking the Redis protocol (RESP), for
+    workers spread over several hosts. Talks RESP directly over one asyncio
+    connection, so no Redis client library is needed.
+
+    Size-based eviction is left to the server (maxmemory with an LRU
+    policy); values larger than max_value_bytes are not stored.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", max_value_bytes: int = 4 * 1024 * 1024,
+                 prefix: str = "jobagg:"):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.max_value_bytes = max_value_bytes
+        self.prefix = prefix
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._send("AUTH", self.password)
+        if self.db:
+            await self._send("SELECT", str(self.db))
+
+    async def command(self, *args: str) -> Any:
+        """Send one command and return its decoded reply."""
+        async with self._lock:
+            try:
+                if self._writer is None or self._writer.is_closing():
+                    await self._connect()
+                return await self._send(*args)
+            except BaseException:
+                # A broken connection, or a command cancelled before its reply
+                # was read, which would hand that reply to the next command.
+                # Drop the connection either way; the next command reconnects.
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                raise
+
+    async def _send(self, *args: str) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._writer.write(b"".join(parts))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readuntil(b"\r\n")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisProtocolError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            count = int(rest)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        data = await self.command("GET", self.prefix + key)
+        return None if data is None else json.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        data = json.dumps(value)
+        if len(data) > self.max_value_bytes:
+            return
+        await self.command("SET", self.prefix + key, data, "PX", str(int(ttl * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self.command("DEL", self.prefix + key)
+
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = await self.command("SET", f"{self.prefix}lock:{name}", token, "NX", "PX", str(int(ttl * 1000)))
+        return token if reply == "OK" else None
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self.command("EVAL", _RELEASE_LOCK_SCRIPT, "1", f"{self.prefix}lock:{name}", token)
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        reply = await self.command(
+            "EVAL", _EXTEND_LOCK_SCRIPT, "1", f"{self.prefix}lock:{name}", token, str(int(ttl * 1000))
+        )
+        return reply == 1
+
+    async def take_token(self, name: str, rate: float, burst: float) -> float:
+        reply = await self.command(
+            "EVAL", _TAKE_TOKEN_SCRIPT, "1", f"{self.prefix}bucket:{name}", repr(rate), repr(burst)
+        )
+        return float(reply)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+
+# Shared backend, opened on app startup when RESULT_CACHE_BACKEND is set
+_shared_cache: Optional[CacheBackend] = None
+
+
+def _build_shared_cache() -> Optional[CacheBackend]:
+    if RESULT_CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(RESULT_CACHE_URL or "result_cache.db")
+    if RESULT_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(RESULT_CACHE_URL or "redis://localhost:6379/0")
+    if RESULT_CACHE_BACKEND:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {RESULT_CACHE_BACKEND}")
+    return None
+
+
+async def open_shared_cache() -> Optional[CacheBackend]:
+    """Open the configured shared cache backend. Called from the app lifespan."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = _build_shared_cache()
+    return _shared_cache
+
+
+async def close_shared_cache() -> None:
+    global _shared_cache
+    if _shared_cache is not None:
+        await _shared_cache.close()
+        _shared_cache = None
+
+
+def get_shared_cache() -> Optional[CacheBackend]:
+    """Return the shared cache backend, or None if none is configured or open."""
+    return _shared_cache
@@ -0,0 +1,186 @@
+import asyncio
+import codecs
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+# Record/replay of raw TinyFish SSE sessions, overridable via environment.
+# TINYFISH_CASSETTE_MODE is "record", "replay" or empty for neither.
+# TINYFISH_REPLAY_SPEED divides recorded gaps between chunks: 1 replays in
+# real time, 10 ten times faster, 0 without any delay.
+TINYFISH_CASSETTE_MODE = os.getenv("TINYFISH_CASSETTE_MODE", "")
+TINYFISH_CASSETTE_DIR = os.getenv("TINYFISH_CASSETTE_DIR", "cassettes")
+TINYFISH_REPLAY_SPEED = float(os.getenv("TINYFISH_REPLAY_SPEED", "1.0"))
+
+
+def _target_url(request: httpx.Request) -> str:
+    """The board URL an agent run request is for, which keys its cassette."""
+    try:
+        return json.loads(request.content).get("url", "")
+    except (ValueError, AttributeError):
+        return ""
+
+
+class CassetteStore:
+    """
+    Recorded sessions on disk, one gzip file per target URL.
+
+    Each session is one JSON line: the URL, response status and headers,
+    and the body as [seconds since previous chunk, text] pairs. New
+    sessions are appended as extra gzip members, so a file holds every
+    recording for its URL and replay cycles through them.
+
+    Saves run in worker threads, and runs for the same URL (a hedged run
+    and its backup, say) can finish together, so saves to one file are
+    serialized; otherwise their writes could interleave within the file.
+    """
+
+    def __init__(self, directory: str = TINYFISH_CASSETTE_DIR):
+        self.directory = directory
+        self._sessions: Dict[str, List[dict]] = {}
+        self._next: Dict[str, int] = {}
+        self._save_locks: Dict[str, threading.Lock] = {}
+        self._save_locks_guard = threading.Lock()
+
+    def path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.jsonl.gz")
+
+    def save(self, session: dict) -> None:
+        path = self.path(session["url"])
+        line = json.dumps(session, separators=(",", ":")) + "\n"
+        with self._save_locks_guard:
+            lock = self._save_locks.setdefault(path, threading.Lock())
+        os.makedirs(self.directory, exist_ok=True)
+        with lock, gzip.open(path, "at", encoding="utf-8") as f:
+            f.write(line)
+
+    def next_session(self, url: str) -> Optional[dict]:
+        """The next recorded session for url, cycling through all of them."""
+        if url not in self._sessions:
+            path = self.path(url)
+            sessions = []
+            if os.path.exists(path):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    sessions = [json.loads(line) for line in f if line.strip()]
+            self._sessions[url] = sessions
+
+        sessions = self._sessions[url]
+        if not sessions:
+            return None
+        index = self._next.get(url, 0)
+        self._next[url] = index + 1
+        return sessions[index % len(sessions)]
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Passes a response body through, noting each chunk and when it came."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, store: CassetteStore, session: dict):
+        self._inner = inner
+        self._store = store
+        self._session = session
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._last = time.monotonic()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._inner:
+            now = time.monotonic()
+            text = self._decoder.decode(chunk)
+            if text:
+                self._session["chunks"].append([round(now - self._last, 3), text])
+                self._last = now
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+        # Dropped and partial streams are kept too; they are real shapes
+        await asyncio.to_thread(self._store.save, self._session)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Sends requests for real and records every response to a CassetteStore."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, store: CassetteStore):
+        self._inner = inner
+        self._store = store
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self._inner.handle_async_request(request)
+        session = {
+            "url": _target_url(request),
+            "recorded_at": time.time(),
+            "status": response.status_code,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() in ("content-type", "retry-after")
+            },
+            "first_byte": round(time.monotonic() - started, 3),
+            "chunks": [],
+        }
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, self._store, session),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: List[Tuple[float, str]], speed: float):
+        self._chunks = chunks
+        self._speed = speed
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for delay, text in self._chunks:
+            if self._speed > 0 and delay > 0:
+                await asyncio.sleep(delay / self._speed)
+            yield text.encode("utf-8")
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Answers requests from recorded sessions instead of the network, with
+    the recorded timing divided by `speed`. URLs without a recording get a
+    404 so the run fails like any other API error.
+    """
+
+    def __init__(self, store: CassetteStore, speed: float = TINYFISH_REPLAY_SPEED):
+        self._store = store
+        self.speed = speed
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = _target_url(request)
+        session = self._store.next_session(url)
+        if session is None:
+            return httpx.Response(404, text=f"No cassette recorded for {url}", request=request)
+
+        if self.speed > 0 and session.get("first_byte"):
+            await asyncio.sleep(session["first_byte"] / self.speed)
+        return httpx.Response(
+            status_code=session["status"],
+            headers=session["headers"],
+            stream=_ReplayStream(session["chunks"], self.speed),
+            request=request,
+        )
+
+
+def cassette_transport(inner: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """Wrap or replace the TinyFish transport according to TINYFISH_CASSETTE_MODE."""
+    if TINYFISH_CASSETTE_MODE == "record":
+        return RecordingTransport(inner, CassetteStore())
+    if TINYFISH_CASSETTE_MODE == "replay":
+        return ReplayTransport(CassetteStore())
+    if TINYFISH_CASSETTE_MODE:
+        raise ValueError(f"Unknown TINYFISH_CASSETTE_MODE: {TINYFISH_CASSETTE_MODE}")
+    return inner
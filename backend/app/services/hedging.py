@@ -0,0 +1,114 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+# Request hedging for boards with a long latency tail, overridable via
+# environment. Boards opt in with "hedge": True in JOB_BOARD_CONFIGS and can
+# set "hedge_after" (seconds) or "hedge_percentile" to pick the threshold.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "90"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.1"))
+
+# Sentinel a run's pump task puts on the queue once the run has ended
+_RUN_DONE = object()
+
+
+class HedgeBudget:
+    """
+    Keeps hedged runs to at most `ratio` extra runs per primary run, so
+    hedging trims the tail without multiplying load on the upstream.
+    """
+
+    def __init__(self, ratio: float = HEDGE_BUDGET):
+        self.ratio = ratio
+        self.runs = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def record_run(self) -> None:
+        self.runs += 1
+
+    def allows_hedge(self) -> bool:
+        return self.hedges + 1 <= self.ratio * self.runs
+
+    def record_hedge(self) -> None:
+        self.hedges += 1
+
+    def snapshot(self) -> dict:
+        return {"runs": self.runs, "hedges": self.hedges, "hedge_wins": self.wins, "budget": self.ratio}
+
+
+async def hedged_events(
+    primary: AsyncIterator[Dict[str, Any]],
+    start_hedge: Callable[[], Optional[AsyncIterator[Dict[str, Any]]]],
+    hedge_after: Optional[float],
+    budget: Optional[HedgeBudget] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the events of an agent run, racing a second run against it if
+    the first hasn't finished after hedge_after seconds.
+
+    start_hedge() returns the second run, or None if one can't be started
+    right now (no budget or no free slot); it is asked once. Progress
+    events come from the primary run only. The first COMPLETE from either
+    run is yielded and the other run is cancelled; an ERROR is only
+    yielded once neither run can still complete.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(index: int, source: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for event in source:
+                await queue.put((index, event))
+        except Exception as e:
+            await queue.put((index, {"type": "ERROR", "message": str(e)}))
+        finally:
+            await queue.put((index, _RUN_DONE))
+
+    loop = asyncio.get_running_loop()
+    deadline = None if hedge_after is None else loop.time() + hedge_after
+    tasks = [asyncio.create_task(pump(0, primary))]
+    running = {0}
+    last_error = None
+
+    try:
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                index, event = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                deadline = None
+                hedge = start_hedge()
+                if hedge is not None:
+                    tasks.append(asyncio.create_task(pump(1, hedge)))
+                    running.add(1)
+                    yield {"type": "STATUS", "message": "Slower than usual, started a backup run..."}
+                continue
+
+            if event is _RUN_DONE:
+                running.discard(index)
+                continue
+
+            kind = event.get("type")
+            if kind == "COMPLETE":
+                if index == 1 and budget is not None:
+                    budget.wins += 1
+                yield event
+                return
+            if kind == "ERROR":
+                # Terminal for this run; the other one may still complete
+                last_error = event
+                running.discard(index)
+                if index == 0:
+                    deadline = None
+                continue
+            if index == 0:
+                yield event
+
+        if last_error is not None:
+            yield last_error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
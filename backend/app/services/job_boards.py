@@ -1,9 +1,15 @@
+from string import Formatter
+from typing import Set
+from urllib.parse import quote_plus
+
 from app.models.schemas import JobBoard
 
 JOB_BOARD_CONFIGS = {
     JobBoard.LINKEDIN: {
         "name": "LinkedIn",
         "url_template": "https://www.linkedin.com/jobs/search/?keywords={keywords}&location={location}&f_TPR=r259200&sortBy=DD",
+        # Auth walls tend to persist for a while, so remember failures longer
+        "error_ttl": 300,
         "goal": """You are searching for RECENT job listings on LinkedIn (filtered to past 72 hours).
 
 STEP 1 - WAIT FOR PAGE:
@@ -188,6 +194,11 @@ If no jobs found, return: {"jobs": []}"""
     JobBoard.GLASSDOOR: {
         "name": "Glassdoor",
         "url_template": "https://www.glassdoor.com/Job/jobs.htm?sc.keyword={keywords}&fromAge=3&sortBy=date_desc",
+        # Popups and blocks tend to persist for a while, so remember failures longer
+        "error_ttl": 300,
+        # Most runs finish in about a minute but a few take the full timeout;
+        # race a second run against ones slower than the usual p90
+        "hedge": True,
         "goal": """You are searching for RECENT jobs on Glassdoor (filtered to past 3 days).
 
 STEP 1 - HANDLE POPUPS:
@@ -232,11 +243,30 @@ def get_board_config(board: JobBoard) -> dict:
     return JOB_BOARD_CONFIGS.get(board, {})
 
 
+def get_template_params(board: JobBoard) -> Set[str]:
+    """Names of the parameters a board's url_template actually uses."""
+    url_template = get_board_config(board).get("url_template", "")
+    return {field for _, field, _, _ in Formatter().parse(url_template) if field}
+
+
+def board_uses_location(board: JobBoard) -> bool:
+    """
+    Whether the board's search URL depends on the location. Boards that
+    ignore it get the same URL (and so share one agent run and cache entry)
+    for every location; their results have to be filtered locally.
+    """
+    return "location" in get_template_params(board)
+
+
 def build_search_url(board: JobBoard, keywords: str, location: str) -> str:
-    """Build the search URL for a job board with given parameters."""
+    """
+    Build the search URL for a job board with given parameters.
+    Values are percent-encoded; canonicalize them first (see services.query)
+    so equivalent searches map to the same URL.
+    """
     config = get_board_config(board)
     url_template = config.get("url_template", "")
     return url_template.format(
-        keywords=keywords.replace(" ", "+"),
-        location=location.replace(" ", "+")
+        keywords=quote_plus(keywords),
+        location=quote_plus(location),
     )
@@ -0,0 +1,248 @@
+import asyncio
+import math
+import os
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from app.models.schemas import JobBoard
+from app.services.board_stats import OUTCOME_OK
+
+# Concurrency caps for TinyFish agent runs, overridable via environment.
+# Boards can set their own cap with "max_concurrent_runs" in JOB_BOARD_CONFIGS.
+TINYFISH_MAX_CONCURRENT_RUNS = int(os.getenv("TINYFISH_MAX_CONCURRENT_RUNS", "20"))
+TINYFISH_MAX_RUNS_PER_BOARD = int(os.getenv("TINYFISH_MAX_RUNS_PER_BOARD", "5"))
+
+# Adaptive control of the global cap. TINYFISH_MAX_CONCURRENT_RUNS is the
+# ceiling; the limit moves between ADAPTIVE_MIN_LIMIT and that ceiling.
+ADAPTIVE_CONCURRENCY = os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() in ("1", "true", "yes")
+ADAPTIVE_MIN_LIMIT = int(os.getenv("ADAPTIVE_MIN_LIMIT", "2"))
+ADAPTIVE_LATENCY_TOLERANCE = float(os.getenv("ADAPTIVE_LATENCY_TOLERANCE", "2.0"))
+ADAPTIVE_ERROR_RATE = float(os.getenv("ADAPTIVE_ERROR_RATE", "0.3"))
+ADAPTIVE_BACKOFF = float(os.getenv("ADAPTIVE_BACKOFF", "0.7"))
+ADAPTIVE_COOLDOWN = float(os.getenv("ADAPTIVE_COOLDOWN", "10"))
+
+
+class Ticket:
+    """A place in the limiter queue, and then a running slot once granted."""
+
+    def __init__(self, board: JobBoard):
+        self.board = board
+        self.granted = False
+        self.position = 0
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+
+    async def wait_for_change(self) -> None:
+        """Wait until the ticket is granted or its queue position changes."""
+        await self._changed.wait()
+        self._changed.clear()
+
+
+class ConcurrencyLimiter:
+    """
+    Caps how many agent runs are open at once, globally and per board.
+
+    Waiters are served in arrival order (FIFO) across all client requests. A
+    waiter whose board is at its cap doesn't hold up waiters for other
+    boards behind it.
+    """
+
+    def __init__(
+        self,
+        limit: int = TINYFISH_MAX_CONCURRENT_RUNS,
+        board_limits: Optional[Dict[JobBoard, int]] = None,
+        default_board_limit: int = TINYFISH_MAX_RUNS_PER_BOARD,
+    ):
+        self.limit = limit
+        self.board_limits = board_limits or {}
+        self.default_board_limit = default_board_limit
+        self.active = 0
+        self._active_per_board: Dict[JobBoard, int] = {}
+        self._queue: Deque[Ticket] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def set_limit(self, limit: int) -> None:
+        """Change the global cap, granting queued waiters if it went up."""
+        self.limit = limit
+        self._dispatch()
+
+    def board_limit(self, board: JobBoard) -> int:
+        return self.board_limits.get(board, self.default_board_limit)
+
+    def enqueue(self, board: JobBoard) -> Ticket:
+        """Join the queue for a slot. Check ticket.granted, then wait_for_change()."""
+        ticket = Ticket(board)
+        self._queue.append(ticket)
+        self._dispatch()
+        return ticket
+
+    def has_free_slot(self, board: JobBoard) -> bool:
+        """Whether a run for board could start now without jumping the queue."""
+        return (
+            not self._queue
+            and self.active < self.limit
+            and self._active_per_board.get(board, 0) < self.board_limit(board)
+        )
+
+    def try_acquire(self, board: JobBoard) -> Optional[Ticket]:
+        """Take a slot only if one is free right now; never queue."""
+        if not self.has_free_slot(board):
+            return None
+        return self.enqueue(board)
+
+    def release(self, ticket: Ticket) -> None:
+        """Give back a granted slot, or leave the queue if still waiting."""
+        if ticket.granted:
+            ticket.granted = False
+            self.active -= 1
+            self._active_per_board[ticket.board] -= 1
+        elif ticket in self._queue:
+            self._queue.remove(ticket)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters in FIFO order and update queue positions."""
+        waiting: Deque[Ticket] = deque()
+        while self._queue:
+            ticket = self._queue.popleft()
+            board_active = self._active_per_board.get(ticket.board, 0)
+            if self.active < self.limit and board_active < self.board_limit(ticket.board):
+                ticket.granted = True
+                self.active += 1
+                self._active_per_board[ticket.board] = board_active + 1
+                ticket._notify()
+            else:
+                waiting.append(ticket)
+        self._queue = waiting
+
+        for position, ticket in enumerate(self._queue, start=1):
+            if ticket.position != position:
+                ticket.position = position
+                ticket._notify()
+
+
+class AdaptiveLimit:
+    """
+    AIMD (additive increase, multiplicative decrease) control of a
+    ConcurrencyLimiter's global cap, driven by how agent runs turn out.
+
+    A run signals overload when more than error_rate of the last `window`
+    runs failed (timeouts included), or when its board's latency has drifted
+    above the board's baseline by more than latency_tolerance. Latency is
+    judged per block of latency_window successful runs: the block's
+    geometric mean against the lowest of the board's previous
+    baseline_windows blocks, and it takes two slow blocks in a row. A slow
+    run from a long-tailed board, or one unlucky block, doesn't count; a
+    board that stays slower for good becomes its own baseline again.
+
+    Overload multiplies the limit by `backoff`, at most once per `cooldown`
+    seconds so one burst of failures counts once, and restarts the current
+    latency blocks. Every other successful run adds 1/limit (held while its
+    board's last block was slow), so the limit grows by about one per
+    limit's worth of healthy runs.
+
+    clock (seconds) times the cooldown; simulations pass their own.
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        min_limit: int = ADAPTIVE_MIN_LIMIT,
+        max_limit: Optional[int] = None,
+        latency_tolerance: float = ADAPTIVE_LATENCY_TOLERANCE,
+        error_rate: float = ADAPTIVE_ERROR_RATE,
+        backoff: float = ADAPTIVE_BACKOFF,
+        cooldown: float = ADAPTIVE_COOLDOWN,
+        window: int = 20,
+        latency_window: int = 50,
+        baseline_windows: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiter = limiter
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else limiter.limit
+        self.latency_tolerance = latency_tolerance
+        self.error_rate = error_rate
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.latency_window = latency_window
+        self.clock = clock
+        self.value = float(self.max_limit)
+        self.decreases = 0
+        self._recent_failures: Deque[bool] = deque(maxlen=window)
+        self._last_decrease = float("-inf")
+        # Per board: log latencies of the current block of successful runs,
+        # the mean log latency of its previous blocks, and whether the last
+        # block was slow
+        self._block: Dict[JobBoard, List[float]] = {}
+        self._block_means: Dict[JobBoard, Deque[float]] = defaultdict(lambda: deque(maxlen=baseline_windows))
+        self._slow_block: Dict[JobBoard, bool] = {}
+        self._warmed_up: Set[JobBoard] = set()
+
+    def _latency_drifted(self, board: JobBoard, latency: float) -> bool:
+        """Add a successful run's latency to board's block; on a full block, compare it to the baseline."""
+        block = self._block.setdefault(board, [])
+        block.append(math.log(max(latency, 1e-6)))
+        if len(block) < self.latency_window:
+            return False
+
+        mean = sum(block) / len(block)
+        block.clear()
+        if board not in self._warmed_up:
+            # The first block is the first runs to finish, the fastest of
+            # those started together; as a baseline it would be too low
+            self._warmed_up.add(board)
+            return False
+        history = self._block_means[board]
+        slow = bool(history) and mean - min(history) > math.log(self.latency_tolerance)
+        history.append(mean)
+        drifted = slow and self._slow_block.get(board, False)
+        self._slow_block[board] = slow
+        return drifted
+
+    def _overloaded(self, board: JobBoard, latency: float, outcome: str) -> bool:
+        # A single timeout is no more telling than a single slow run; both
+        # only count in aggregate
+        if outcome == OUTCOME_OK and self._latency_drifted(board, latency):
+            return True
+
+        window = self._recent_failures
+        return len(window) >= window.maxlen // 2 and sum(window) / len(window) > self.error_rate
+
+    def on_result(self, board: JobBoard, latency: float, outcome: str) -> None:
+        """Feed one finished run."""
+        self._recent_failures.append(outcome != OUTCOME_OK)
+
+        if self._overloaded(board, latency, outcome):
+            now = self.clock()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self.value = max(self.min_limit, self.value * self.backoff)
+                self.decreases += 1
+                # Judge the new limit only by runs that finish under it
+                for block in self._block.values():
+                    block.clear()
+                self._slow_block.clear()
+        elif outcome == OUTCOME_OK and not self._slow_block.get(board):
+            # Not while the board's last block was slow and the next one
+            # will tell whether that was overload
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+
+        if int(self.value) != self.limiter.limit:
+            self.limiter.set_limit(int(self.value))
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limiter.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "decreases": self.decreases,
+            "recent_error_rate": round(sum(self._recent_failures) / len(self._recent_failures), 3)
+            if self._recent_failures else 0.0,
+        }
@@ -0,0 +1,89 @@
+import os
+from typing import List, Optional
+
+from app.models.schemas import JobBoard
+from app.services.board_stats import BoardStats
+
+# Latency percentile used to predict whether a board finishes within a
+# search's latency budget, overridable via environment. Higher is more
+# conservative: fewer boards are run, but those run rarely miss the budget.
+PLAN_LATENCY_PERCENTILE = float(os.getenv("PLAN_LATENCY_PERCENTILE", "75"))
+
+# What a search does for a board
+ACTION_CACHE = "cache"    # answered from the result or failure cache right away
+ACTION_RUN = "run"        # start an agent run
+ACTION_STALE = "stale"    # too slow for the budget, serve the expired cached result
+ACTION_SKIP = "skip"      # too slow for the budget and nothing cached
+
+# Order in which planned boards are started
+_ACTION_ORDER = {ACTION_CACHE: 0, ACTION_RUN: 1, ACTION_STALE: 2, ACTION_SKIP: 3}
+
+
+def plan_board(
+    board: JobBoard,
+    stats: BoardStats,
+    budget: Optional[float],
+    cache_age: Optional[float],
+    fresh_ttl: float,
+    recently_failed: bool = False,
+    breaker_open: bool = False,
+    allow_stale: bool = True,
+) -> dict:
+    """
+    Decide how a search handles one board, from its run history and cache.
+
+    A board whose predicted latency (its PLAN_LATENCY_PERCENTILE latency)
+    exceeds the budget is served stale from the cache if possible (and
+    allow_stale) and skipped otherwise. Boards without history are always
+    run.
+    """
+    fallback = ACTION_STALE if cache_age is not None and allow_stale else ACTION_SKIP
+    predicted = stats.percentile(board, PLAN_LATENCY_PERCENTILE)
+    plan = {
+        "board": board.value,
+        "predicted_seconds": None if predicted is None else round(predicted, 1),
+        "expected_jobs": stats.mean_jobs(board),
+        "cache_age_seconds": None if cache_age is None else int(cache_age),
+        "cache_fresh": cache_age is not None and cache_age < fresh_ttl,
+        "recently_failed": recently_failed,
+        "breaker_open": breaker_open,
+    }
+
+    if plan["cache_fresh"] or recently_failed:
+        plan.update(action=ACTION_CACHE, reason="Answered from cache")
+    elif breaker_open:
+        plan.update(
+            action=fallback,
+            reason="Board is temporarily unavailable",
+        )
+    elif budget is None or predicted is None or predicted <= budget:
+        plan.update(
+            action=ACTION_RUN,
+            reason=(
+                "No latency budget" if budget is None
+                else "No run history yet" if predicted is None
+                else "Expected to finish within the budget"
+            ),
+        )
+    else:
+        # Whole seconds, except where that would round a short run to "0s"
+        usual = f"{predicted:.1f}" if predicted < 10 else f"{predicted:.0f}"
+        plan.update(
+            action=fallback,
+            reason=f"Usually takes about {usual}s, more than the {budget:g}s budget",
+        )
+    return plan
+
+
+def order_plans(plans: List[dict]) -> List[dict]:
+    """
+    Order board plans for starting: cache answers first, then runs with
+    the most expected jobs per second of latency, then the rest.
+    """
+    def key(plan: dict):
+        yield_rate = 0.0
+        if plan["action"] == ACTION_RUN and plan["predicted_seconds"]:
+            yield_rate = (plan["expected_jobs"] or 0.0) / plan["predicted_seconds"]
+        return _ACTION_ORDER[plan["action"]], -yield_rate
+
+    return sorted(plans, key=key)
@@ -0,0 +1,96 @@
+import json
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+# Common spellings mapped to one canonical form. Keys and values are
+# compared after case folding and whitespace collapsing.
+KEYWORD_ALIASES: Dict[str, str] = {
+    "ml engineer": "machine learning engineer",
+    "ml eng": "machine learning engineer",
+    "mle": "machine learning engineer",
+    "ai eng": "ai engineer",
+    "artificial intelligence engineer": "ai engineer",
+    "swe": "software engineer",
+    "software developer": "software engineer",
+    "sde": "software engineer",
+    "ds": "data scientist",
+}
+
+LOCATION_ALIASES: Dict[str, str] = {
+    "sf": "san francisco",
+    "san fran": "san francisco",
+    "san francisco, ca": "san francisco",
+    "sf bay area": "san francisco bay area",
+    "bay area": "san francisco bay area",
+    "nyc": "new york",
+    "new york city": "new york",
+    "new york, ny": "new york",
+    "la": "los angeles",
+    "los angeles, ca": "los angeles",
+    "remote": "remote",
+    "remote us": "remote",
+    "remote - us": "remote",
+    "remote (us)": "remote",
+    "us remote": "remote",
+    "anywhere": "remote",
+    "wfh": "remote",
+    "work from home": "remote",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _load_alias_file() -> None:
+    """
+    Merge extra aliases from the JSON file in QUERY_ALIASES_FILE, shaped as
+    {"keywords": {"alias": "canonical"}, "locations": {...}}.
+    """
+    path = os.getenv("QUERY_ALIASES_FILE")
+    if not path:
+        return
+
+    with open(path) as f:
+        data = json.load(f)
+
+    for target, aliases in ((KEYWORD_ALIASES, data.get("keywords", {})),
+                            (LOCATION_ALIASES, data.get("locations", {}))):
+        target.update({_fold(k): _fold(v) for k, v in aliases.items()})
+
+
+def _fold(text: str) -> str:
+    """Case-fold and collapse runs of whitespace."""
+    return _WHITESPACE.sub(" ", text.casefold()).strip()
+
+
+def canonicalize_keywords(keywords: str) -> str:
+    """Canonical form of a keyword query, e.g. " ML  Engineer" -> "machine learning engineer"."""
+    folded = _fold(keywords)
+    return KEYWORD_ALIASES.get(folded, folded)
+
+
+def canonicalize_location(location: str) -> str:
+    """Canonical form of a location, e.g. "SF" -> "san francisco"."""
+    folded = _fold(location)
+    return LOCATION_ALIASES.get(folded, folded)
+
+
+def canonicalize_query(keywords: str, location: str) -> Tuple[str, str]:
+    """Canonicalize a (keywords, location) pair before URLs and cache keys are built."""
+    return canonicalize_keywords(keywords), canonicalize_location(location)
+
+
+def location_matches(job_location: Optional[str], location: str) -> bool:
+    """
+    Whether a job's free-text location matches a canonical search location.
+    Any alias of the location counts, e.g. "SF, CA" matches "san francisco".
+    """
+    if not location:
+        return True
+
+    text = _fold(job_location or "")
+    names = {location} | {alias for alias, canonical in LOCATION_ALIASES.items() if canonical == location}
+    return any(re.search(rf"\b{re.escape(name)}\b", text) for name in names)
+
+
+_load_alias_file()
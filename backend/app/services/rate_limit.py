@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import os
+import time
+
+from app.services.cache_backends import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Client-side rate limit for starting TinyFish agent runs, matching the
+# plan's requests-per-minute quota. 0 disables it.
+TINYFISH_RATE_LIMIT = float(os.getenv("TINYFISH_RATE_LIMIT", "0"))
+TINYFISH_RATE_BURST = float(os.getenv("TINYFISH_RATE_BURST", "10"))
+
+
+class TokenBucket:
+    """
+    Token bucket that every TinyFish request has to pass before it is sent.
+
+    Tokens refill at rate_per_minute / 60 per second, up to `burst`. Callers
+    wait in FIFO order for a token rather than failing. With a shared cache
+    backend the bucket lives there, so all workers share one quota;
+    otherwise (or if the backend errors) each worker has its own bucket.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = TINYFISH_RATE_LIMIT,
+        burst: float = TINYFISH_RATE_BURST,
+        name: str = "tinyfish",
+    ):
+        self.rate = rate_per_minute / 60
+        self.burst = max(1.0, burst)
+        self.name = name
+        self.waiting = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        # asyncio.Lock wakes waiters in arrival order, which makes the queue FIFO
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    async def acquire(self) -> float:
+        """Wait for a token. Returns how many seconds were spent waiting."""
+        if not self.enabled:
+            return 0.0
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    wait = await self._take()
+                    if wait <= 0:
+                        return time.monotonic() - started
+                    await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+
+    async def _take(self) -> float:
+        shared = get_shared_cache()
+        if shared is not None:
+            try:
+                return await shared.take_token(self.name, self.rate, self.burst)
+            except Exception as e:
+                logger.warning("Shared rate limit unavailable, using the local bucket: %s", e)
+        return self._take_local()
+
+    def _take_local(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def snapshot(self) -> dict:
+        return {
+            "rate_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "waiting": self.waiting,
+            "shared": get_shared_cache() is not None,
+        }
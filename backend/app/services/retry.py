@@ -0,0 +1,55 @@
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Retries of transient TinyFish failures, overridable via environment.
+# TINYFISH_MAX_RETRIES caps retries of one agent run; TINYFISH_RETRY_BUDGET
+# caps retries across all boards of one search.
+TINYFISH_MAX_RETRIES = int(os.getenv("TINYFISH_MAX_RETRIES", "2"))
+TINYFISH_RETRY_BUDGET = int(os.getenv("TINYFISH_RETRY_BUDGET", "4"))
+TINYFISH_RETRY_BASE_DELAY = float(os.getenv("TINYFISH_RETRY_BASE_DELAY", "1.0"))
+TINYFISH_RETRY_MAX_DELAY = float(os.getenv("TINYFISH_RETRY_MAX_DELAY", "20.0"))
+
+# Upstream statuses worth another attempt: rate limited or a gateway hiccup
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class RetryBudget:
+    """
+    Number of retries one search may spend across all of its boards, so a
+    struggling upstream gets a few more attempts rather than a retry storm.
+    """
+
+    def __init__(self, retries: int = TINYFISH_RETRY_BUDGET):
+        self.remaining = retries
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. False if it is used up."""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = TINYFISH_RETRY_BASE_DELAY,
+    cap: float = TINYFISH_RETRY_MAX_DELAY,
+) -> float:
+    """Capped exponential backoff with full jitter for retry number attempt (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
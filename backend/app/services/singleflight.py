@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Turns the exception a run's source raised into its final event
+ErrorEvent = Callable[[Exception], Dict[str, Any]]
+
+# Sentinel put on a subscriber's queue once the flight has finished
+_FLIGHT_DONE = object()
+
+
+class Flight:
+    """
+    One shared run of an event stream, fanned out to any number of subscribers.
+
+    Every event is recorded, so subscribers that join late get the events so
+    far replayed before following the live stream. The run is cancelled once
+    its last subscriber leaves, unless a subscriber asked for it to keep
+    running (e.g. a background refresh that should still fill the cache).
+
+    If the source raises, the run ends with on_error(exception) as its last
+    event (if given), so subscribers still see how it ended.
+    """
+
+    def __init__(self, source: AsyncIterator[Dict[str, Any]], on_error: Optional[ErrorEvent] = None):
+        self.on_error = on_error
+        self.events: List[Dict[str, Any]] = []
+        self.done = False
+        self.cancelled = False
+        self.keep_running = False
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.task = asyncio.create_task(self._run(source))
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def _run(self, source: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for event in source:
+                self._publish(event)
+        except Exception as e:
+            logger.warning("Shared run failed: %s", e)
+            if self.on_error is not None:
+                self._publish(self.on_error(e))
+        finally:
+            self.done = True
+            for queue in self._subscribers:
+                queue.put_nowait(_FLIGHT_DONE)
+
+    def add_subscriber(self) -> asyncio.Queue:
+        """Register a subscriber, pre-loaded with every event so far."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        if self.done:
+            queue.put_nowait(_FLIGHT_DONE)
+        else:
+            self._subscribers.add(queue)
+        return queue
+
+    def remove_subscriber(self, queue: asyncio.Queue) -> None:
+        """Unregister a subscriber, cancelling the run if nobody is left."""
+        self._subscribers.discard(queue)
+        if not self._subscribers and not self.done and not self.keep_running:
+            self.cancelled = True
+            self.task.cancel()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent runs with the same key into one shared Flight.
+
+    The first subscriber for a key starts the run; everyone who subscribes
+    to the same key while it is in flight shares its events.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flights
+
+    async def subscribe(
+        self,
+        key: str,
+        factory: Callable[[], AsyncIterator[Dict[str, Any]]],
+        keep_running: bool = False,
+        on_error: Optional[ErrorEvent] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Yield the events of the in-flight run for key, starting one with
+        factory() if there is none. on_error makes the final event of a
+        run started here whose source raised (see Flight).
+
+        With keep_running, the run is not cancelled when its subscribers
+        leave; it finishes in the background.
+        """
+        flight = self._flights.get(key)
+        if flight is None or flight.cancelled:
+            flight = Flight(factory(), on_error)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.keep_running = flight.keep_running or keep_running
+        queue = flight.add_subscriber()
+        try:
+            while True:
+                event = await queue.get()
+                if event is _FLIGHT_DONE:
+                    return
+                yield event
+        finally:
+            flight.remove_subscriber(queue)
+
+    def detach(self, key: str) -> None:
+        """Let the run for key, if any, finish even after its subscribers leave."""
+        flight = self._flights.get(key)
+        if flight is not None and not flight.cancelled:
+            flight.keep_running = True
+
+    def _forget(self, key: str, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
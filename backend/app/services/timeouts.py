@@ -0,0 +1,43 @@
+import os
+from typing import Optional
+
+from app.models.schemas import JobBoard
+from app.services.board_stats import BoardStats
+
+# Per-board agent run timeouts, learned from recent run latencies and
+# overridable via environment. A board can pin its own with "timeout"
+# (seconds) in JOB_BOARD_CONFIGS.
+AGENT_TIMEOUT_DEFAULT = float(os.getenv("AGENT_TIMEOUT_DEFAULT", "300"))
+AGENT_TIMEOUT_MIN = float(os.getenv("AGENT_TIMEOUT_MIN", "60"))
+AGENT_TIMEOUT_MAX = float(os.getenv("AGENT_TIMEOUT_MAX", "300"))
+AGENT_TIMEOUT_PERCENTILE = float(os.getenv("AGENT_TIMEOUT_PERCENTILE", "99"))
+AGENT_TIMEOUT_MARGIN = float(os.getenv("AGENT_TIMEOUT_MARGIN", "1.5"))
+AGENT_TIMEOUT_MIN_SAMPLES = int(os.getenv("AGENT_TIMEOUT_MIN_SAMPLES", "20"))
+
+
+def learned_timeout(
+    stats: BoardStats,
+    board: JobBoard,
+    config: dict,
+    override: Optional[float] = None,
+) -> float:
+    """
+    Timeout in seconds for one agent run on board.
+
+    A per-request override wins (kept between AGENT_TIMEOUT_MIN and
+    AGENT_TIMEOUT_MAX), then the board's configured "timeout". Otherwise
+    it is the board's latency percentile times a safety margin, kept
+    between AGENT_TIMEOUT_MIN and AGENT_TIMEOUT_MAX, or
+    AGENT_TIMEOUT_DEFAULT until there is enough history.
+    """
+    if override is not None:
+        return min(AGENT_TIMEOUT_MAX, max(AGENT_TIMEOUT_MIN, override))
+    if "timeout" in config:
+        return config["timeout"]
+    if stats.samples(board) < AGENT_TIMEOUT_MIN_SAMPLES:
+        return AGENT_TIMEOUT_DEFAULT
+
+    latency = stats.percentile(board, AGENT_TIMEOUT_PERCENTILE)
+    if latency is None:
+        return AGENT_TIMEOUT_DEFAULT
+    return min(AGENT_TIMEOUT_MAX, max(AGENT_TIMEOUT_MIN, latency * AGENT_TIMEOUT_MARGIN))
@@ -1,9 +1,42 @@
+import asyncio
 import httpx
+import importlib.util
 import json
+import logging
 import os
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, Dict, Any, Optional
 
-TINYFISH_API_URL = "https://agent.tinyfish.ai/v1/automation/run-sse"
+from app.services.cassettes import cassette_transport
+from app.services.rate_limit import TokenBucket
+from app.services.retry import (
+    RetryBudget,
+    RETRYABLE_STATUS_CODES,
+    TINYFISH_MAX_RETRIES,
+    TINYFISH_RETRY_MAX_DELAY,
+    backoff_delay,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+# Overridable so the app can run against a local stand-in
+# (see benchmarks/fake_tinyfish.py)
+TINYFISH_API_URL = os.getenv("TINYFISH_API_URL", "https://agent.tinyfish.ai/v1/automation/run-sse")
+
+# Client-side read timeout for a single agent run, in seconds
+REQUEST_TIMEOUT = 360.0
+
+# How much longer than the agent's own timeout the client waits, so the
+# agent can report its timeout before the client gives up
+REQUEST_TIMEOUT_SLACK = 60.0
+
+# Every request to TinyFish, retries included, waits for a token here so
+# bursts queue up instead of running into the API's 429 quota errors
+rate_limiter = TokenBucket()
+
+# Shared client, created on app startup so every board run reuses
+# already-open connections instead of paying a new TCP+TLS handshake
+_client: Optional[httpx.AsyncClient] = None
 
 
 def get_api_key() -> str:
@@ -13,25 +46,102 @@ def get_api_key() -> str:
     return api_key
 
 
+def _build_client() -> httpx.AsyncClient:
+    """Create the pooled TinyFish client from environment settings."""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("TINYFISH_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("TINYFISH_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("TINYFISH_KEEPALIVE_EXPIRY", "60")),
+    )
+
+    http2 = os.getenv("TINYFISH_HTTP2", "false").lower() in ("1", "true", "yes")
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("TINYFISH_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    # Pool settings go on the transport, which TINYFISH_CASSETTE_MODE may
+    # wrap to record sessions or replace to replay them
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(REQUEST_TIMEOUT),
+        transport=cassette_transport(transport),
+    )
+
+
+async def start_client() -> httpx.AsyncClient:
+    """Open the shared TinyFish client. Called from the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared TinyFish client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the lifespan hasn't run."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
 async def run_tinyfish_agent(
     url: str,
     goal: str,
-    timeout: int = 300000
+    timeout: int = 300000,
+    retry_budget: Optional[RetryBudget] = None,
 ) -> AsyncGenerator[Dict[str, Any], None]:
     """
     Calls TinyFish API and yields SSE events as they arrive.
-    
+
+    Transient failures (connection errors, 429/502/503/504 responses and
+    streams that end before COMPLETE) are retried up to TINYFISH_MAX_RETRIES
+    times with jittered exponential backoff, or after the Retry-After the
+    API asked for. Each retry also spends one from retry_budget, if given,
+    and is announced with a STATUS event.
+
+    Each attempt first waits its turn at the rate limiter (see
+    TINYFISH_RATE_LIMIT), announced with a STATUS event if others are
+    already waiting.
+
+    The client gives up REQUEST_TIMEOUT_SLACK seconds after the agent's own
+    timeout, whether the stream went silent or kept trickling events.
+
     Args:
         url: The target URL to navigate to
         goal: Natural language instruction for what to extract
         timeout: Timeout in milliseconds (default 5 minutes)
-    
+        retry_budget: Retries shared with the other boards of the search
+
     Yields:
         Dict containing SSE event data (streamingUrl, STATUS, COMPLETE, etc.)
     """
     api_key = get_api_key()
-    
-    async with httpx.AsyncClient(timeout=httpx.Timeout(360.0)) as client:
+    client = get_client()
+    loop = asyncio.get_running_loop()
+    client_timeout = timeout / 1000 + REQUEST_TIMEOUT_SLACK
+
+    attempt = 0
+    while True:
+        # Set when this attempt failed: the ERROR event to report if it
+        # isn't retried, and why it may be retried
+        error = None
+        retry_reason = None
+        retry_after = None
+        finished = False
+
+        if rate_limiter.enabled and rate_limiter.waiting:
+            yield {"type": "STATUS", "message": "Waiting for TinyFish rate limit..."}
+        await rate_limiter.acquire()
+        deadline = loop.time() + client_timeout
+
         try:
             async with client.stream(
                 "POST",
@@ -45,31 +155,77 @@ async def run_tinyfish_agent(
                     "goal": goal,
                     "timeout": timeout,
                 },
+                timeout=httpx.Timeout(client_timeout),
             ) as response:
                 if response.status_code != 200:
                     error_text = await response.aread()
-                    yield {
+                    error = {
                         "type": "ERROR",
                         "message": f"TinyFish API error: {response.status_code} - {error_text.decode()}"
                     }
-                    return
-                
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data_str = line[6:].strip()
-                        if data_str and data_str != "[DONE]":
-                            try:
-                                yield json.loads(data_str)
-                            except json.JSONDecodeError:
-                                # Skip malformed JSON
-                                pass
-        except httpx.TimeoutException:
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        retry_reason = f"returned {response.status_code}"
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                else:
+                    async for line in response.aiter_lines():
+                        if loop.time() > deadline:
+                            raise httpx.ReadTimeout("Agent run exceeded its timeout")
+                        if line.startswith("data: "):
+                            data_str = line[6:].strip()
+                            if data_str and data_str != "[DONE]":
+                                try:
+                                    event = json.loads(data_str)
+                                except json.JSONDecodeError:
+                                    # Skip malformed JSON
+                                    continue
+                                if event.get("type") in ("COMPLETE", "ERROR"):
+                                    finished = True
+                                yield event
+
+                    if not finished:
+                        error = {"type": "ERROR", "message": "TinyFish stream ended before the run completed"}
+                        retry_reason = "stream ended early"
+        except (httpx.ReadTimeout, httpx.WriteTimeout):
+            # The run itself took too long; running it again would too
             yield {
                 "type": "ERROR",
-                "message": "Request timed out"
+                "message": "Request timed out",
+                "timeout": True,
             }
+            return
+        except httpx.TransportError as e:
+            if finished:
+                return
+            if isinstance(e, httpx.TimeoutException):
+                error = {"type": "ERROR", "message": "Request timed out", "timeout": True}
+            else:
+                error = {"type": "ERROR", "message": str(e) or type(e).__name__}
+            retry_reason = "connection failed"
         except Exception as e:
             yield {
                 "type": "ERROR",
                 "message": str(e)
             }
+            return
+
+        if error is None:
+            return
+
+        if (
+            retry_reason is None
+            or attempt >= TINYFISH_MAX_RETRIES
+            or (retry_after is not None and retry_after > TINYFISH_RETRY_MAX_DELAY)
+            or (retry_budget is not None and not retry_budget.try_spend())
+        ):
+            yield error
+            return
+
+        attempt += 1
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        yield {
+            "type": "STATUS",
+            "message": f"TinyFish {retry_reason}, retrying in {delay:.0f}s "
+                       f"(retry {attempt} of {TINYFISH_MAX_RETRIES})...",
+            "retry": attempt,
+        }
+        await asyncio.sleep(delay)
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.models.schemas import JobBoard
+
+logger = logging.getLogger(__name__)
+
+# Cache warming settings, overridable via environment
+CACHE_WARM_ENABLED = os.getenv("CACHE_WARM_ENABLED", "false").lower() in ("1", "true", "yes")
+CACHE_WARM_TOP_N = int(os.getenv("CACHE_WARM_TOP_N", "20"))
+CACHE_WARM_INTERVAL = float(os.getenv("CACHE_WARM_INTERVAL", "60"))
+CACHE_WARM_AHEAD = float(os.getenv("CACHE_WARM_AHEAD", "120"))
+CACHE_WARM_MAX_CONCURRENCY = int(os.getenv("CACHE_WARM_MAX_CONCURRENCY", "2"))
+CACHE_WARM_HALF_LIFE = float(os.getenv("CACHE_WARM_HALF_LIFE", "3600"))
+# Popularity (searches, decayed) a URL needs above this to be kept warm; the
+# default takes more than one recent search
+CACHE_WARM_MIN_SCORE = float(os.getenv("CACHE_WARM_MIN_SCORE", "1.0"))
+
+
+class QueryPopularity:
+    """
+    Exponentially decaying hit counts per board search URL, so the ranking
+    follows what people are searching for now rather than all-time totals.
+
+    Only URLs scoring above min_score are ranked. URLs that decay below half
+    of it are forgotten, so a one-off search doesn't linger.
+    """
+
+    def __init__(
+        self,
+        half_life: float = CACHE_WARM_HALF_LIFE,
+        max_entries: int = 1000,
+        min_score: float = CACHE_WARM_MIN_SCORE,
+    ):
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self.min_score = min_score
+        # url -> (board, score, last_updated)
+        self._scores: Dict[str, Tuple[JobBoard, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decayed(self, score: float, last_updated: float, now: float) -> float:
+        return score * math.pow(0.5, (now - last_updated) / self.half_life)
+
+    def record(self, board: JobBoard, url: str) -> None:
+        now = time.monotonic()
+        _, score, last_updated = self._scores.get(url, (board, 0.0, now))
+        self._scores[url] = (board, self._decayed(score, last_updated, now) + 1.0, now)
+
+        if len(self._scores) > self.max_entries:
+            least = min(self._scores, key=lambda u: self._decayed(*self._scores[u][1:], now))
+            del self._scores[least]
+
+    def top(self, n: int) -> List[Tuple[JobBoard, str]]:
+        """The n most popular (board, url) pairs above min_score, most popular first."""
+        now = time.monotonic()
+        scores = {
+            url: self._decayed(score, last_updated, now)
+            for url, (_, score, last_updated) in self._scores.items()
+        }
+        for url, score in scores.items():
+            if score < self.min_score / 2:
+                del self._scores[url]
+
+        ranked = sorted(
+            (url for url in self._scores if scores[url] > self.min_score),
+            key=scores.get,
+            reverse=True,
+        )
+        return [(self._scores[url][0], url) for url in ranked[:n]]
+
+
+class CacheWarmer:
+    """
+    Background scheduler that re-runs the most popular board searches before
+    their cached results go stale.
+
+    Every `interval` seconds it asks should_warm(url) for each of the top_n
+    most popular URLs and runs warm(board, url) for those that need it, with
+    at most max_concurrency warm-up runs at once so interactive searches
+    keep the bulk of the agent capacity.
+    """
+
+    def __init__(
+        self,
+        should_warm: Callable[[str], Awaitable[bool]],
+        warm: Callable[[JobBoard, str], Awaitable[None]],
+        popularity: Optional[QueryPopularity] = None,
+        top_n: int = CACHE_WARM_TOP_N,
+        interval: float = CACHE_WARM_INTERVAL,
+        max_concurrency: int = CACHE_WARM_MAX_CONCURRENCY,
+    ):
+        self.should_warm = should_warm
+        self.warm = warm
+        self.popularity = popularity if popularity is not None else QueryPopularity()
+        self.top_n = top_n
+        self.interval = interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._warming: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def record(self, board: JobBoard, url: str) -> None:
+        """Count a search for a board URL towards its popularity."""
+        self.popularity.record(board, url)
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning("Cache warming pass failed: %s", e)
+
+    async def run_once(self) -> int:
+        """Start warm-up runs for popular URLs that need one. Returns how many."""
+        started = 0
+        for board, url in self.popularity.top(self.top_n):
+            if url in self._warming or not await self.should_warm(url):
+                continue
+
+            self._warming.add(url)
+            task = asyncio.create_task(self._warm_one(board, url))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started += 1
+        return started
+
+    async def _warm_one(self, board: JobBoard, url: str) -> None:
+        try:
+            async with self._semaphore:
+                await self.warm(board, url)
+        except Exception as e:
+            logger.warning("Cache warming failed for %s: %s", url, e)
+        finally:
+            self._warming.discard(url)
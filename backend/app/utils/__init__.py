@@ -1 +1,4 @@
 # Utils module
+from .posted_date import parse_posted_date, posted_date_cache_info
+
+__all__ = ["parse_posted_date", "posted_date_cache_info"]
@@ -0,0 +1,120 @@
+import os
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Distinct posted_date strings whose parse is memoized. Boards send the same
+# few relative strings ("2 days ago", "1d") over and over, and absolute
+# dates only change daily, so a small cache covers almost every job.
+POSTED_DATE_CACHE_SIZE = int(os.getenv("POSTED_DATE_CACHE_SIZE", "4096"))
+
+# What a parse yields: an age in seconds, relative to whenever the string
+# was read, or an absolute epoch timestamp
+_AGE = "age"
+_AT = "at"
+
+_RECENT = re.compile(r"\b(?:just|now|today|moments?|recently)\b")
+
+# "2 days ago", "an hour ago", "30+ days ago", "5 hrs ago", "3 hours",
+# anywhere in the text
+_RELATIVE = re.compile(
+    r"\b(\d+|an?)\+?\s*(second|sec|minute|min|hour|hr|day|week|wk|month|year|yr)s?\b"
+)
+
+# "2d", "5h", "1mo", "Posted 2d ago", "2d+"; "mo" before "m" so months
+# aren't minutes, and a word boundary so "10 Mar 2026" isn't 10 minutes
+_SHORT = re.compile(r"(\d+)\+?\s*(mo|yr|s|m|h|d|w)\b")
+
+# "2026-02-10", "02/10/2026", "02-10-2026", "Feb 10, 2026", "10 February 2026"
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_NUMERIC = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})")
+_MONTH_FIRST = re.compile(r"([a-z]+)\.? (\d{1,2}),? (\d{4})")
+_DAY_FIRST = re.compile(r"(\d{1,2}) ([a-z]+)\.?,? (\d{4})")
+
+_UNIT_SECONDS = {
+    "second": 1, "sec": 1, "minute": 60, "min": 60, "hour": 3600, "hr": 3600, "day": 86400,
+    "week": 7 * 86400, "wk": 7 * 86400, "month": 730 * 3600, "year": 8760 * 3600,
+    "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "mo": 730 * 3600, "yr": 8760 * 3600,
+}
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+    ], start=1)
+    for name in names
+}
+
+
+def _timestamp(year: int, month: Optional[int], day: int) -> Optional[Tuple[str, float]]:
+    """Local midnight of the date, like a naive strptime, or None if invalid."""
+    if month is None:
+        return None
+    try:
+        return _AT, datetime(year, month, day).timestamp()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=POSTED_DATE_CACHE_SIZE)
+def _parse(posted_date: str) -> Optional[Tuple[str, float]]:
+    text = posted_date.lower().strip()
+
+    if _RECENT.search(text):
+        return _AGE, 0.0
+
+    match = _RELATIVE.search(text)
+    if match:
+        count = 1 if match.group(1) in ("a", "an") else int(match.group(1))
+        return _AGE, float(count * _UNIT_SECONDS[match.group(2)])
+
+    match = _SHORT.search(text)
+    if match:
+        return _AGE, float(int(match.group(1)) * _UNIT_SECONDS[match.group(2)])
+
+    match = _ISO.fullmatch(text)
+    if match:
+        return _timestamp(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    match = _NUMERIC.fullmatch(text)
+    if match:
+        return _timestamp(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+    match = _MONTH_FIRST.fullmatch(text)
+    if match:
+        return _timestamp(int(match.group(3)), _MONTHS.get(match.group(1)), int(match.group(2)))
+    match = _DAY_FIRST.fullmatch(text)
+    if match:
+        return _timestamp(int(match.group(3)), _MONTHS.get(match.group(2)), int(match.group(1)))
+
+    return None
+
+
+def parse_posted_date(posted_date: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Epoch timestamp a job was posted at, or None if posted_date can't be
+    parsed. Relative strings are counted back from `now` (default: the
+    current time).
+
+    Handles:
+    - Relative: "2 days ago", "an hour ago", "5 mins ago", "3 hours",
+      "just now", "today"
+    - Short form: "1d", "2h", "1mo", "Posted 2d ago"
+    - Absolute: "Feb 10, 2026", "2026-02-10", "02/10/2026", "10 Feb 2026"
+    """
+    if not posted_date:
+        return None
+    parsed = _parse(posted_date)
+    if parsed is None:
+        return None
+    kind, value = parsed
+    if kind == _AGE:
+        return (time.time() if now is None else now) - value
+    return value
+
+
+def posted_date_cache_info() -> dict:
+    info = _parse.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,220 @@
+"""
+Simulate the adaptive concurrency limiter against a synthetic upstream.
+
+A fixed pool of clients keeps asking for agent runs through a
+ConcurrencyLimiter controlled by AdaptiveLimit. The fake upstream has a
+capacity that changes over time (the latency curve): runs beyond capacity
+get slower in proportion to the overload, and runs far beyond it fail or
+time out.
+
+The simulation is discrete-event on a simulated clock: runs finish in
+order of their synthetic latency and AdaptiveLimit's cooldown is timed on
+the same clock, so a given --seed always gives the same result and the
+whole run takes well under a second.
+
+The limit should follow the capacity: in the second half of each phase its
+average has to stay within --tolerance of that phase's capacity, give or
+take --slack runs for the sawtooth AIMD makes at small limits.
+
+A second run simulates a healthy long-tailed upstream (--tail-seconds)
+with the production latency settings: it has room for every client, never
+fails, and its latency is lognormal with --tail-sigma regardless of load,
+like Glassdoor's profile in benchmarks/fake_tinyfish.py. Slow runs from the
+tail are not overload, so the limit must never be lowered.
+
+If either check fails the script exits with status 1. Pass --trace to print
+the full time series. tests/test_adaptive_limit.py runs the same checks.
+
+Usage (from backend/):
+    python -m benchmarks.adaptive_limiter_sim [--phases 12,4,16] [--clients 40]
+"""
+import argparse
+import heapq
+import json
+import random
+import statistics
+import sys
+from typing import List, Tuple
+
+from app.models.schemas import JobBoard
+from app.services.board_stats import OUTCOME_OK, OUTCOME_ERROR, OUTCOME_TIMEOUT
+from app.services.limiter import ConcurrencyLimiter, AdaptiveLimit
+
+BOARD = JobBoard.LINKEDIN
+
+
+class SyntheticUpstream:
+    """
+    Upstream whose latency grows with load above its current capacity.
+    Latency noise is uniform +-20%, or lognormal with `sigma` if set.
+    """
+
+    def __init__(self, base_latency: float, rng: random.Random):
+        self.base_latency = base_latency
+        self.capacity = 1
+        self.sigma = 0.0
+        self.in_flight = 0
+        self.runs = 0
+        self.rng = rng
+
+    def noise(self) -> float:
+        if self.sigma:
+            return self.rng.lognormvariate(0, self.sigma)
+        return self.rng.uniform(0.8, 1.2)
+
+    def start(self) -> Tuple[float, str]:
+        """Start a run; returns how long it takes and how it ends."""
+        self.runs += 1
+        self.in_flight += 1
+        overload = max(0, self.in_flight - self.capacity) / self.capacity
+        latency = self.base_latency * (1 + 3 * overload) * self.noise()
+        if overload > 0 and latency > self.base_latency * 8:
+            return self.base_latency * 8, OUTCOME_TIMEOUT
+        if overload > 0.5 and self.rng.random() < overload / 2:
+            return latency, OUTCOME_ERROR
+        return latency, OUTCOME_OK
+
+
+def simulate(schedule: List[Tuple[int, float, float]], clients: int, base_latency: float,
+             max_limit: int, seed: int, **control_kwargs) -> dict:
+    """
+    Run the clients through `schedule`, a list of (capacity, latency sigma,
+    seconds) phases, sampling the limit every base_latency seconds of
+    simulated time. control_kwargs go to AdaptiveLimit.
+    """
+    rng = random.Random(seed)
+    now = 0.0
+    limiter = ConcurrencyLimiter(limit=max_limit, default_board_limit=max_limit)
+    control = AdaptiveLimit(limiter, min_limit=1, max_limit=max_limit, cooldown=base_latency * 2,
+                            clock=lambda: now, **control_kwargs)
+    upstream = SyntheticUpstream(base_latency, rng)
+    # Runs in flight as (finishes_at, sequence, latency, outcome, ticket)
+    running: list = []
+    sequence = 0
+    idle = clients
+
+    trace = []
+    next_sample = base_latency
+    phase_start = 0.0
+    for phase, (capacity, sigma, seconds) in enumerate(schedule):
+        upstream.capacity = capacity
+        upstream.sigma = sigma
+        phase_end = phase_start + seconds
+        while True:
+            # Every idle client asks for a run; those the limiter lets through start
+            while idle:
+                ticket = limiter.try_acquire(BOARD)
+                if ticket is None:
+                    break
+                idle -= 1
+                latency, outcome = upstream.start()
+                sequence += 1
+                heapq.heappush(running, (now + latency, sequence, latency, outcome, ticket))
+
+            finishes_at = running[0][0] if running else phase_end
+            while next_sample <= min(finishes_at, phase_end):
+                trace.append({
+                    "t": round(next_sample, 3),
+                    "phase": phase,
+                    "capacity": capacity,
+                    "limit": limiter.limit,
+                    "in_flight": upstream.in_flight,
+                    "waiting": idle,
+                })
+                next_sample += base_latency
+            if finishes_at > phase_end:
+                break
+
+            now, _, latency, outcome, ticket = heapq.heappop(running)
+            upstream.in_flight -= 1
+            idle += 1
+            limiter.release(ticket)
+            control.on_result(BOARD, latency, outcome)
+        now = phase_start = phase_end
+
+    return {"runs": upstream.runs, "decreases": control.decreases, "trace": trace}
+
+
+def settled(trace: List[dict], phase: int) -> List[int]:
+    """Limits sampled in the second half of a phase."""
+    points = [p["limit"] for p in trace if p["phase"] == phase]
+    return points[len(points) // 2:]
+
+
+def capacity_phases(capacities: List[int], phase_seconds: float, clients: int, base_latency: float,
+                    max_limit: int, seed: int, **control_kwargs) -> dict:
+    """Run a capacity schedule; returns the settled limit of each phase and the run."""
+    run = simulate([(capacity, 0.0, phase_seconds) for capacity in capacities],
+                   clients, base_latency, max_limit, seed, **control_kwargs)
+    phases = []
+    for phase, capacity in enumerate(capacities):
+        points = settled(run["trace"], phase)
+        phases.append({
+            "capacity": capacity,
+            "mean_limit_settled": round(statistics.mean(points), 2),
+            "min_limit_settled": min(points),
+            "max_limit_settled": max(points),
+        })
+    return {"phases": phases, "run": run}
+
+
+def follows_capacity(phase: dict, tolerance: float, slack: float) -> bool:
+    """Whether a phase's settled limit is within tolerance (relative) plus slack (runs) of its capacity."""
+    return abs(phase["mean_limit_settled"] - phase["capacity"]) <= tolerance * phase["capacity"] + slack
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phases", default="12,4,16", help="Upstream capacity per phase, comma separated")
+    parser.add_argument("--phase-seconds", type=float, default=150.0, help="Simulated seconds per phase")
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--base-latency", type=float, default=1.0, help="Unloaded run latency in seconds")
+    parser.add_argument("--max-limit", type=int, default=30)
+    # The capacity phases' synthetic upstream has little latency noise, so
+    # they can use a tighter tolerance and shorter latency blocks than the
+    # defaults
+    parser.add_argument("--latency-tolerance", type=float, default=1.5)
+    parser.add_argument("--latency-window", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative error of the settled limit")
+    parser.add_argument("--slack", type=float, default=2.0, help="Allowed absolute error on top, in runs")
+    parser.add_argument("--tail-seconds", type=float, default=300.0,
+                        help="Simulated length of the healthy long-tail phase (0 skips it)")
+    parser.add_argument("--tail-sigma", type=float, default=0.9, help="Lognormal sigma of that phase's latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", action="store_true", help="Include the full time series")
+    args = parser.parse_args()
+
+    capacities = [int(c) for c in args.phases.split(",")]
+    capacity_run = capacity_phases(
+        capacities, args.phase_seconds, args.clients, args.base_latency, args.max_limit, args.seed,
+        latency_tolerance=args.latency_tolerance, latency_window=args.latency_window,
+    )
+    phases = capacity_run["phases"]
+    failed = [
+        phase for phase in phases
+        if not follows_capacity(phase, args.tolerance, args.slack)
+    ]
+    result = {"phases": phases, "decreases": capacity_run["run"]["decreases"]}
+
+    # The tail phase runs with the production latency settings
+    tail_ok = True
+    if args.tail_seconds > 0:
+        tail_run = simulate(
+            [(args.clients, args.tail_sigma, args.tail_seconds)],
+            args.clients, args.base_latency, args.max_limit, args.seed,
+        )
+        tail_ok = tail_run["decreases"] == 0
+        result["tail"] = {
+            "sigma": args.tail_sigma,
+            "runs": tail_run["runs"],
+            "decreases": tail_run["decreases"],
+            "min_limit": min(p["limit"] for p in tail_run["trace"]),
+        }
+        if args.trace:
+            result["tail"]["trace"] = tail_run["trace"]
+
+    if args.trace:
+        result["trace"] = capacity_run["run"]["trace"]
+    result["passed"] = not failed and tail_ok
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["passed"] else 1)
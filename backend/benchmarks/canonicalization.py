@@ -0,0 +1,106 @@
+"""
+Count the upstream agent runs query canonicalization saves on a query log.
+
+Each (keywords, location) query in the log is expanded to one search URL per
+board. Every distinct URL is one upstream TinyFish run (and one cache key).
+The script compares the legacy URL building (spaces swapped for "+") with
+canonicalize_query + build_search_url.
+
+The log is a JSON-lines file of {"keywords": ..., "location": ...}. Without
+--log, a synthetic log of realistic spelling variants is generated.
+
+Usage (from backend/):
+    python -m benchmarks.canonicalization [--log queries.jsonl] [--size 5000]
+"""
+import argparse
+import json
+import random
+from typing import List, Tuple
+
+from app.models.schemas import JobBoard
+from app.services.job_boards import JOB_BOARD_CONFIGS, build_search_url
+from app.services.query import canonicalize_query
+
+BASE_QUERIES = [
+    ("AI Engineer", "San Francisco"),
+    ("AI Engineer", "Remote"),
+    ("Machine Learning Engineer", "New York"),
+    ("Machine Learning Engineer", "Remote"),
+    ("Software Engineer", "San Francisco"),
+    ("Data Scientist", "New York"),
+    ("LLM Engineer", "Remote"),
+    ("Research Scientist", "San Francisco"),
+]
+
+KEYWORD_VARIANTS = {
+    "Machine Learning Engineer": ["ML Engineer", "ml engineer", "MLE"],
+    "Software Engineer": ["SWE", "software developer", "Software Developer"],
+    "AI Engineer": ["ai engineer", "AI engineer", "Artificial Intelligence Engineer"],
+    "Data Scientist": ["data scientist", "DS"],
+}
+
+LOCATION_VARIANTS = {
+    "San Francisco": ["SF", "san francisco", "San Francisco, CA", "san fran"],
+    "New York": ["NYC", "new york", "New York City", "New York, NY"],
+    "Remote": ["remote", "Remote - US", "Anywhere", "WFH", "remote (US)"],
+}
+
+
+def _vary(text: str, variants: dict, rng: random.Random) -> str:
+    text = rng.choice([text] + variants.get(text, []))
+    if rng.random() < 0.2:
+        text = text.upper() if rng.random() < 0.5 else text.lower()
+    if rng.random() < 0.2:
+        text = f" {text.replace(' ', '  ')} "
+    return text
+
+
+def synthetic_log(size: int, seed: int = 0) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    log = []
+    for _ in range(size):
+        keywords, location = rng.choice(BASE_QUERIES)
+        log.append((_vary(keywords, KEYWORD_VARIANTS, rng), _vary(location, LOCATION_VARIANTS, rng)))
+    return log
+
+
+def legacy_search_url(board: JobBoard, keywords: str, location: str) -> str:
+    """build_search_url as it was before canonicalization."""
+    return JOB_BOARD_CONFIGS[board]["url_template"].format(
+        keywords=keywords.replace(" ", "+"),
+        location=location.replace(" ", "+"),
+    )
+
+
+def count_runs(log: List[Tuple[str, str]]) -> dict:
+    legacy, canonical = set(), set()
+    for keywords, location in log:
+        canonical_query = canonicalize_query(keywords, location)
+        for board in JOB_BOARD_CONFIGS:
+            legacy.add(legacy_search_url(board, keywords, location))
+            canonical.add(build_search_url(board, *canonical_query))
+
+    return {
+        "queries": len(log),
+        "distinct_queries": len(set(log)),
+        "legacy_upstream_runs": len(legacy),
+        "canonical_upstream_runs": len(canonical),
+        "runs_saved": len(legacy) - len(canonical),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="JSON-lines query log to replay")
+    parser.add_argument("--size", type=int, default=5000, help="Synthetic log size when --log is not given")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log) as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+        log = [(q["keywords"], q["location"]) for q in queries]
+    else:
+        log = synthetic_log(args.size, args.seed)
+
+    print(json.dumps(count_runs(log), indent=2))
@@ -0,0 +1,13 @@
+"""Helpers shared by the benchmark scripts."""
+import subprocess
+from typing import Optional
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, to tag results with, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
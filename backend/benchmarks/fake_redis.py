@@ -0,0 +1,187 @@
+"""
+Local stand-in for a Redis server, for running the shared cache
+(RESULT_CACHE_BACKEND=redis) in tests and load tests without a real one.
+
+It speaks RESP and implements just what RedisCacheBackend sends: PING,
+AUTH, SELECT, GET, SET (with PX and NX), DEL, TIME, and EVAL of the
+backend's own scripts (lock release and extension, token bucket), which
+are run as Python equivalents. Everything lives in one process-wide dict;
+there is no persistence and only one database.
+
+reply_delay holds every reply back that many seconds, to test clients
+that give up on a command before its reply arrives.
+
+Usage (from backend/):
+    python -m benchmarks.fake_redis [--port 6380] [--password secret]
+and RESULT_CACHE_BACKEND=redis RESULT_CACHE_URL=redis://127.0.0.1:6380/0
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any, List, Optional
+
+from app.services.cache_backends import _EXTEND_LOCK_SCRIPT, _RELEASE_LOCK_SCRIPT, _TAKE_TOKEN_SCRIPT
+
+
+class _Error(Exception):
+    """An error reply to send back to the client."""
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, _Error):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    data = str(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class FakeRedis:
+    def __init__(self, password: Optional[str] = None, reply_delay: float = 0.0):
+        self.password = password
+        self.reply_delay = reply_delay
+        self.commands: Counter = Counter()
+        # key -> (value, expires_at or None); values are str or dict (hashes)
+        self._data: dict = {}
+
+    def _lookup(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection, replying to its commands in order."""
+        authenticated = self.password is None
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                name = args[0].upper()
+                self.commands[name] += 1
+                if name == "AUTH":
+                    authenticated = args[1:] == [self.password]
+                    reply = "OK" if authenticated else _Error("WRONGPASS invalid password")
+                elif not authenticated:
+                    reply = _Error("NOAUTH Authentication required.")
+                else:
+                    try:
+                        reply = self.execute(name, args[1:])
+                    except (_Error, IndexError, ValueError) as e:
+                        reply = e if isinstance(e, _Error) else _Error(f"ERR syntax error in {name}")
+                if self.reply_delay:
+                    await asyncio.sleep(self.reply_delay)
+                # OK / PONG are simple strings, like the real server sends them
+                writer.write(b"+%s\r\n" % reply.encode() if reply in ("OK", "PONG") else _encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[str]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            raise ConnectionError(f"Unsupported request: {line!r}")
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2].decode())
+        return args
+
+    def execute(self, name: str, args: List[str]) -> Any:
+        if name == "PING":
+            return "PONG"
+        if name == "SELECT":
+            return "OK"
+        if name == "TIME":
+            now = time.time()
+            return [str(int(now)), str(int(now % 1 * 1_000_000))]
+        if name == "GET":
+            value = self._lookup(args[0])
+            if isinstance(value, dict):
+                raise _Error("WRONGTYPE Operation against a key holding the wrong kind of value")
+            return value
+        if name == "DEL":
+            return sum(1 for key in args if self._data.pop(key, None) is not None)
+        if name == "SET":
+            return self._set(args)
+        if name == "EVAL":
+            return self._eval(args)
+        raise _Error(f"ERR unknown command '{name}'")
+
+    def _set(self, args: List[str]) -> Any:
+        key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+        expires_at = None
+        if "PX" in options:
+            expires_at = time.time() + int(args[2 + options.index("PX") + 1]) / 1000
+        if "NX" in options and self._lookup(key) is not None:
+            return None
+        self._data[key] = (value, expires_at)
+        return "OK"
+
+    def _eval(self, args: List[str]) -> Any:
+        script, count = args[0], int(args[1])
+        keys, argv = args[2:2 + count], args[2 + count:]
+        if script == _RELEASE_LOCK_SCRIPT:
+            if self._lookup(keys[0]) == argv[0]:
+                del self._data[keys[0]]
+                return 1
+            return 0
+        if script == _EXTEND_LOCK_SCRIPT:
+            if self._lookup(keys[0]) == argv[0]:
+                self._data[keys[0]] = (argv[0], time.time() + int(argv[1]) / 1000)
+                return 1
+            return 0
+        if script == _TAKE_TOKEN_SCRIPT:
+            return self._take_token(keys[0], float(argv[0]), float(argv[1]))
+        raise _Error("NOSCRIPT The stand-in only runs RedisCacheBackend's scripts")
+
+    def _take_token(self, key: str, rate: float, burst: float) -> str:
+        now = time.time()
+        state = self._lookup(key) or {}
+        tokens = float(state.get("tokens", burst))
+        updated_at = float(state.get("updated_at", now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._data[key] = ({"tokens": tokens, "updated_at": now}, now + burst / rate + 1)
+        return repr(wait)
+
+
+async def start_fake_redis(fake: FakeRedis, host: str = "127.0.0.1", port: int = 0) -> tuple:
+    """Start serving `fake`. Returns the asyncio server and the port it listens on."""
+    server = await asyncio.start_server(fake.handle, host, port)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _serve(args) -> None:
+    server, port = await start_fake_redis(FakeRedis(args.password, args.reply_delay), args.host, args.port)
+    print(f"Fake Redis listening on {args.host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    parser.add_argument("--password")
+    parser.add_argument("--reply-delay", type=float, default=0.0, help="Seconds every reply is held back")
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,241 @@
+"""
+Local stand-in for the TinyFish run-sse API, for benchmarks and load tests
+that shouldn't spend real agent runs.
+
+It speaks the same protocol as POST /v1/automation/run-sse: a streamingUrl
+event, STATUS events while "browsing", then COMPLETE with resultJson (or an
+ERROR). How each board behaves comes from a profile: latency distribution,
+error / timeout / HTTP error / dropped-stream rates, how often STATUS events
+drip out and how many jobs come back. The board is recognized from the
+target URL's host.
+
+Point the aggregator at it with
+    TINYFISH_API_URL=http://127.0.0.1:8001/v1/automation/run-sse
+(any TINYFISH_API_KEY works).
+
+Usage (from backend/):
+    python -m benchmarks.fake_tinyfish [--port 8001] [--profile profile.json]
+                                       [--time-scale 0.1] [--seed 0]
+
+A profile file is a JSON object of board id -> settings overriding
+DEFAULT_PROFILE; a "default" entry applies to every board. GET /stats
+returns counts of runs by board and outcome.
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from fastapi import FastAPI, Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+RUN_SSE_PATH = "/v1/automation/run-sse"
+
+
+# How runs for a board behave. Times are in seconds, before --time-scale.
+DEFAULT_PROFILE = {
+    # Run latency: lognormal around latency_median, clipped to latency_max
+    "latency_median": 60.0,
+    "latency_sigma": 0.4,
+    "latency_max": 300.0,
+    # Share of runs that end in an agent ERROR event
+    "error_rate": 0.02,
+    # Share of runs that hang until the requested agent timeout, then ERROR
+    "timeout_rate": 0.01,
+    # Share of requests rejected with one of http_error_codes
+    "http_error_rate": 0.0,
+    "http_error_codes": [429, 503],
+    "retry_after": None,
+    # Share of streams that are cut off before COMPLETE
+    "drop_rate": 0.0,
+    # Seconds between STATUS events while a run is going (slow drip)
+    "status_interval": 10.0,
+    # Jobs in a COMPLETE result
+    "jobs_min": 5,
+    "jobs_max": 10,
+    # Padding added to each job, to mimic bulkier real-world payloads
+    "description_bytes": 0,
+}
+
+# Rough shapes of the real boards: Glassdoor has the long tail, YC and
+# Levels.fyi are quick and small
+BUILTIN_PROFILES = {
+    "linkedin": {**DEFAULT_PROFILE, "latency_median": 70.0, "error_rate": 0.05},
+    "indeed": {**DEFAULT_PROFILE, "latency_median": 50.0},
+    "wellfound": {**DEFAULT_PROFILE, "latency_median": 45.0, "jobs_min": 3, "jobs_max": 8},
+    "yc_jobs": {**DEFAULT_PROFILE, "latency_median": 30.0, "jobs_min": 2, "jobs_max": 6},
+    "levels_fyi": {**DEFAULT_PROFILE, "latency_median": 35.0, "jobs_min": 2, "jobs_max": 6},
+    "glassdoor": {**DEFAULT_PROFILE, "latency_median": 60.0, "latency_sigma": 0.9, "timeout_rate": 0.05},
+}
+
+# Target URL host fragment -> board id
+BOARD_HOSTS = {
+    "linkedin.com": "linkedin",
+    "indeed.com": "indeed",
+    "wellfound.com": "wellfound",
+    "ycombinator.com": "yc_jobs",
+    "workatastartup.com": "yc_jobs",
+    "levels.fyi": "levels_fyi",
+    "glassdoor.com": "glassdoor",
+}
+
+TITLES = ["AI Engineer", "Machine Learning Engineer", "Data Scientist", "Backend Engineer",
+          "Software Engineer", "Platform Engineer", "Research Scientist", "Product Engineer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+             "Pied Piper", "Vandelay", "Soylent"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Remote", "Seattle, WA", "Austin, TX", "London, UK"]
+POSTED_DATES = ["just now", "3 hours ago", "1 day ago", "2 days ago", "5 days ago", "1d", "2h", "1w",
+                "Feb 10, 2026", "2026-02-10", "today", "30+ days ago"]
+
+
+def board_for_url(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    for fragment, board in BOARD_HOSTS.items():
+        if host.endswith(fragment):
+            return board
+    return "default"
+
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, dict]:
+    """Built-in profiles, overridden by the JSON profile file if given."""
+    profiles = dict(BUILTIN_PROFILES)
+    if path is None:
+        return profiles
+
+    with open(path) as f:
+        overrides = json.load(f)
+    default = overrides.get("default", {})
+    for board in set(profiles) | (set(overrides) - {"default"}):
+        settings = {**default, **overrides.get(board, {})}
+        unknown = set(settings) - set(DEFAULT_PROFILE)
+        if unknown:
+            raise ValueError(f"Unknown profile settings for {board}: {sorted(unknown)}")
+        profiles[board] = {**profiles.get(board, DEFAULT_PROFILE), **settings}
+    return profiles
+
+
+def make_jobs(rng: random.Random, board: str, profile: dict) -> list:
+    jobs = []
+    for _ in range(rng.randint(profile["jobs_min"], profile["jobs_max"])):
+        job = {
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "salary": rng.choice([None, "$150,000 - $200,000", "$120k - $160k"]),
+            "url": f"https://{board}.example/jobs/{rng.getrandbits(48):x}",
+            "posted_date": rng.choice(POSTED_DATES),
+        }
+        if profile["description_bytes"]:
+            job["description"] = "x" * profile["description_bytes"]
+        jobs.append(job)
+    return jobs
+
+
+def sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+def create_app(
+    profiles: Optional[Dict[str, dict]] = None,
+    time_scale: float = 1.0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """
+    The fake API. time_scale multiplies every latency and interval (0.01
+    turns a one-minute run into 0.6 s).
+    """
+    profiles = profiles or dict(BUILTIN_PROFILES)
+    rng = random.Random(seed)
+    stats: Counter = Counter()
+    app = FastAPI(title="Fake TinyFish")
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats)
+
+    @app.post(RUN_SSE_PATH)
+    async def run_sse(request: Request):
+        body = await request.json()
+        board = board_for_url(body.get("url", ""))
+        profile = profiles.get(board, DEFAULT_PROFILE)
+        agent_timeout = body.get("timeout", 300000) / 1000
+        stats[f"{board}.requests"] += 1
+
+        if rng.random() < profile["http_error_rate"]:
+            code = rng.choice(profile["http_error_codes"])
+            stats[f"{board}.http_{code}"] += 1
+            headers = {}
+            if profile["retry_after"] is not None:
+                headers["Retry-After"] = str(int(profile["retry_after"]))
+            return PlainTextResponse("Fake TinyFish error", status_code=code, headers=headers)
+
+        # Decide the outcome up front so the stream only has to play it out
+        roll = rng.random()
+        latency = min(
+            profile["latency_max"],
+            rng.lognormvariate(0, profile["latency_sigma"]) * profile["latency_median"],
+        )
+        if roll < profile["timeout_rate"] or latency > agent_timeout:
+            outcome, latency = "timeout", agent_timeout
+        elif roll < profile["timeout_rate"] + profile["error_rate"]:
+            outcome = "error"
+        elif roll < profile["timeout_rate"] + profile["error_rate"] + profile["drop_rate"]:
+            outcome = "drop"
+        else:
+            outcome = "complete"
+        jobs = make_jobs(rng, board, profile) if outcome == "complete" else []
+        run_id = f"{rng.getrandbits(64):x}"
+
+        async def stream():
+            stats[f"{board}.in_flight"] += 1
+            try:
+                yield sse({"streamingUrl": f"https://stream.fake-tinyfish.local/{run_id}"})
+
+                elapsed = 0.0
+                interval = max(profile["status_interval"], 0.001)
+                cut_at = latency * rng.uniform(0.2, 0.8) if outcome == "drop" else None
+                while elapsed < latency:
+                    step = min(interval, latency - elapsed)
+                    if cut_at is not None and elapsed + step >= cut_at:
+                        await asyncio.sleep((cut_at - elapsed) * time_scale)
+                        stats[f"{board}.drop"] += 1
+                        return
+                    await asyncio.sleep(step * time_scale)
+                    elapsed += step
+                    if elapsed < latency:
+                        yield sse({"type": "STATUS", "message": f"Browsing ({int(elapsed)}s)..."})
+
+                stats[f"{board}.{outcome}"] += 1
+                if outcome == "complete":
+                    yield sse({"type": "COMPLETE", "status": "COMPLETED", "resultJson": {"jobs": jobs}})
+                elif outcome == "timeout":
+                    yield sse({"type": "ERROR", "message": "Run timed out"})
+                else:
+                    yield sse({"type": "ERROR", "message": "Agent failed to extract the page"})
+                yield "data: [DONE]\n\n"
+            finally:
+                stats[f"{board}.in_flight"] -= 1
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--profile", help="JSON file of per-board profile overrides")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier for every latency")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(load_profiles(args.profile), args.time_scale, args.seed),
+        host=args.host, port=args.port, log_level="warning",
+    )
@@ -0,0 +1,94 @@
+"""
+Measure the connection setup time the shared TinyFish client saves per search.
+
+A search runs one agent per board at the same time. This compares:
+- cold: a fresh httpx.AsyncClient per board (how run_tinyfish_agent used to work)
+- pooled: the shared client from app.services.tinyfish, warmed by an earlier search
+
+TCP connect and TLS handshake times are taken from httpcore's trace hooks,
+so only connection setup is counted, not server response time.
+
+Usage (from backend/):
+    python -m benchmarks.handshake --boards 6 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.services.tinyfish import TINYFISH_API_URL, start_client, close_client
+
+
+def _base_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+async def _timed_request(client: httpx.AsyncClient, url: str) -> float:
+    """Send one request and return the seconds spent on TCP connect + TLS."""
+    started = {}
+    spent = 0.0
+
+    async def trace(event_name: str, info: dict) -> None:
+        nonlocal spent
+        if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            started[event_name] = time.perf_counter()
+        elif event_name == "connection.connect_tcp.complete":
+            spent += time.perf_counter() - started.pop("connection.connect_tcp.started")
+        elif event_name == "connection.start_tls.complete":
+            spent += time.perf_counter() - started.pop("connection.start_tls.started")
+
+    response = await client.get(url, extensions={"trace": trace})
+    await response.aclose()
+    return spent
+
+
+async def cold_search(url: str, boards: int) -> float:
+    """One search with a new client per board. Returns total handshake seconds."""
+    async def one() -> float:
+        async with httpx.AsyncClient() as client:
+            return await _timed_request(client, url)
+
+    return sum(await asyncio.gather(*(one() for _ in range(boards))))
+
+
+async def pooled_search(client: httpx.AsyncClient, url: str, boards: int) -> float:
+    """One search over the shared client. Returns total handshake seconds."""
+    return sum(await asyncio.gather(*(_timed_request(client, url) for _ in range(boards))))
+
+
+async def main(url: str, boards: int, rounds: int) -> dict:
+    cold = [await cold_search(url, boards) for _ in range(rounds)]
+
+    client = await start_client()
+    try:
+        # First search opens the pool; later searches should reuse it
+        await pooled_search(client, url, boards)
+        pooled = [await pooled_search(client, url, boards) for _ in range(rounds)]
+    finally:
+        await close_client()
+
+    cold_ms = statistics.median(cold) * 1000
+    pooled_ms = statistics.median(pooled) * 1000
+    return {
+        "url": url,
+        "boards": boards,
+        "rounds": rounds,
+        "cold_handshake_ms_per_search": round(cold_ms, 2),
+        "pooled_handshake_ms_per_search": round(pooled_ms, 2),
+        "saved_ms_per_search": round(cold_ms - pooled_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=_base_url(TINYFISH_API_URL), help="URL to request (default: TinyFish API host)")
+    parser.add_argument("--boards", type=int, default=6, help="Concurrent board runs per search")
+    parser.add_argument("--rounds", type=int, default=5, help="Searches to run per mode")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(main(args.url, args.boards, args.rounds)), indent=2))
@@ -0,0 +1,158 @@
+"""
+Micro-benchmarks for the CPU-bound code the search router runs on the event
+loop, over synthetic batches of job postings:
+
+- is_within_max_age on relative ("2 days ago"), short-form ("2d"),
+  absolute ("Feb 10, 2026") and mixed posted_date strings
+- normalize_jobs, the per-job dict rebuild (and posted_at parse) for a
+  COMPLETE result
+- build_search_url, for the keyword/location pairs of a batch
+- SSE framing, the json.dumps + "data: ..." of COMPLETED updates as in
+  search_all_boards (10 jobs per update, as the agents return)
+
+Each case runs --repeat times per batch size and the fastest run is kept,
+in the spirit of pytest-benchmark's min. Results are printed as JSON
+(seconds per batch, ns per item, items per second) so runs can be compared
+across commits.
+
+Usage (from backend/):
+    python -m benchmarks.hot_paths [--sizes 10000,100000,1000000] [--repeat 3]
+        [--cases max_age_mixed,sse_framing] [--output result.json]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from app.models.schemas import JobBoard
+from app.routers.search import is_within_max_age, normalize_jobs
+from app.services.job_boards import build_search_url
+from benchmarks.common import git_commit
+
+BOARDS = list(JobBoard)
+JOBS_PER_UPDATE = 10
+
+RELATIVE_DATES = ["just now", "today", "3 hours ago", "1 day ago", "2 days ago", "3 days ago",
+                  "5 days ago", "1 week ago", "2 weeks ago", "1 month ago", "30+ days ago"]
+SHORT_DATES = ["1h", "5h", "1d", "2d", "3d", "4d", "1w", "2w", "1mo"]
+# Other wordings boards use: abbreviated units, no "ago", text around the
+# short form. Kept in the mixed pool so parser changes that drop them show up.
+VARIANT_DATES = ["2 mins ago", "30 mins ago", "1 hr ago", "5 hrs ago", "3 hours", "2 days", "5 days",
+                 "Posted 2d ago", "Active 3h ago", "2d+", "Reposted 1 day ago", "45 secs ago", "an hour ago"]
+ABSOLUTE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%b %d, %Y", "%B %d, %Y", "%d %b %Y"]
+KEYWORDS = ["AI Engineer", "Machine Learning Engineer", "Software Engineer", "Data Scientist",
+            "Backend Engineer", "LLM Engineer", "Research Scientist", "Product Manager"]
+LOCATIONS = ["San Francisco", "New York", "Remote", "Seattle", "Austin", "London"]
+
+
+def absolute_dates(rng: random.Random, n: int) -> List[str]:
+    now = time.time()
+    return [
+        time.strftime(rng.choice(ABSOLUTE_FORMATS), time.localtime(now - rng.uniform(0, 10) * 86400))
+        for _ in range(n)
+    ]
+
+
+def posted_dates(rng: random.Random, n: int, kind: str) -> List[str]:
+    if kind == "relative":
+        return [rng.choice(RELATIVE_DATES) for _ in range(n)]
+    if kind == "short":
+        return [rng.choice(SHORT_DATES) for _ in range(n)]
+    if kind == "absolute":
+        return absolute_dates(rng, n)
+    # Mixed: roughly what the boards send back, with the odd unparseable one
+    pool = RELATIVE_DATES + SHORT_DATES + VARIANT_DATES + absolute_dates(rng, 50) + ["Reposted", "", "N/A"]
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def raw_jobs(rng: random.Random, n: int) -> List[dict]:
+    dates = posted_dates(rng, n, "mixed")
+    return [
+        {
+            "title": rng.choice(KEYWORDS),
+            "company": f"Company {rng.randrange(5000)}",
+            "location": rng.choice(LOCATIONS),
+            "salary": rng.choice([None, "$150,000 - $200,000"]),
+            "url": f"https://jobs.example/{rng.getrandbits(48):x}",
+            "posted_date": dates[i],
+        }
+        for i in range(n)
+    ]
+
+
+def build_cases(rng: random.Random, size: int) -> Dict[str, Callable[[], None]]:
+    """Each case gets its input built up front so only the hot path is timed."""
+    cases = {}
+
+    for kind in ("relative", "short", "absolute", "mixed"):
+        dates = posted_dates(rng, size, kind)
+        cases[f"max_age_{kind}"] = lambda dates=dates: [is_within_max_age(d) for d in dates]
+
+    jobs = raw_jobs(rng, size)
+    batches = [jobs[i:i + JOBS_PER_UPDATE] for i in range(0, size, JOBS_PER_UPDATE)]
+    cases["normalize_jobs"] = lambda: [normalize_jobs(JobBoard.LINKEDIN, batch) for batch in batches]
+
+    queries = [(rng.choice(BOARDS), rng.choice(KEYWORDS), rng.choice(LOCATIONS)) for _ in range(size)]
+    cases["build_search_url"] = lambda: [build_search_url(*query) for query in queries]
+
+    updates = [
+        {
+            "board": "linkedin",
+            "status": "completed",
+            "message": f"Found {len(batch)} jobs",
+            "jobs": normalize_jobs(JobBoard.LINKEDIN, batch),
+        }
+        for batch in batches
+    ]
+    cases["sse_framing"] = lambda: [f"data: {json.dumps(update)}\n\n" for update in updates]
+    return cases
+
+
+def run(sizes: List[int], repeat: int, only: List[str], seed: int) -> dict:
+    results = []
+    for size in sizes:
+        cases = build_cases(random.Random(seed), size)
+        for name, fn in cases.items():
+            if only and name not in only:
+                continue
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            results.append({
+                "case": name,
+                "items": size,
+                "seconds": round(best, 5),
+                "ns_per_item": round(best / size * 1e9, 1),
+                "items_per_second": int(size / best),
+            })
+            print(f"{name:>20} {size:>9,} items  {best * 1000:10.2f} ms  "
+                  f"{best / size * 1e9:9.1f} ns/item", file=sys.stderr)
+
+    return {"commit": git_commit(), "python": sys.version.split()[0], "repeat": repeat, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated batch sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default="", help="Comma-separated case names (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON result here as well")
+    args = parser.parse_args()
+
+    result = run(
+        [int(size) for size in args.sizes.split(",")],
+        args.repeat,
+        [case for case in args.cases.split(",") if case],
+        args.seed,
+    )
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
@@ -0,0 +1,253 @@
+"""
+End-to-end load test of POST /api/search against a stubbed TinyFish.
+
+Starts the fake TinyFish server (benchmarks/fake_tinyfish.py) or replays
+recorded cassettes, starts the FastAPI app on a local port, then opens
+--clients concurrent SSE searches and reads every stream to [DONE].
+Everything runs in this one process and event loop, so the numbers
+include the client side too; compare runs made with the same settings.
+
+Reported as JSON (stdout, or --output):
+- throughput: searches and SSE events per second
+- time to first event and to first job, and completion latency
+  (p50 / p95 / p99 / max, in seconds)
+- memory: RSS growth while the streams were open, per connection
+- event loop lag: how late a 10 ms timer fired (p50 / p99 / max)
+- the git commit, so results can be compared across commits
+- with the fake upstream, its request and outcome counts per board
+
+Usage (from backend/):
+    python -m benchmarks.load_test [--clients 100] [--distinct-queries 20]
+        [--time-scale 0.01] [--profile profile.json] [--output result.json]
+    python -m benchmarks.load_test --upstream replay --cassettes cassettes/
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+import uvicorn
+
+from benchmarks.common import git_commit
+from benchmarks.fake_tinyfish import RUN_SSE_PATH, create_app, load_profiles
+
+BOARDS = ["linkedin", "indeed", "wellfound", "yc_jobs", "levels_fyi", "glassdoor"]
+LAG_INTERVAL = 0.01
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux), or 0 where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def summarize(values: List[float]) -> Optional[dict]:
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))], 4)
+
+    return {
+        "p50": pct(50), "p95": pct(95), "p99": pct(99),
+        "max": round(ordered[-1], 4), "mean": round(statistics.mean(ordered), 4),
+    }
+
+
+async def start_server(app, port: int) -> tuple:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def stop_server(server, task) -> None:
+    server.should_exit = True
+    await task
+
+
+async def watch_loop_lag(lags: List[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def watch_memory(samples: List[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(rss_bytes())
+        await asyncio.sleep(0.1)
+
+
+async def one_search(client: httpx.AsyncClient, url: str, body: dict) -> dict:
+    """Run one SSE search to the end and time its milestones."""
+    result = {"first_event": None, "first_job": None, "completed": None, "events": 0, "bytes": 0, "error": None}
+    started = time.perf_counter()
+    try:
+        async with client.stream("POST", url, json=body) as response:
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+                return result
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                result["bytes"] += len(line) + 2
+                elapsed = time.perf_counter() - started
+                if line == "data: [DONE]":
+                    result["completed"] = elapsed
+                    break
+                result["events"] += 1
+                if result["first_event"] is None:
+                    result["first_event"] = elapsed
+                if result["first_job"] is None and '"jobs": [{' in line:
+                    result["first_job"] = elapsed
+    except httpx.HTTPError as e:
+        result["error"] = str(e) or type(e).__name__
+    return result
+
+
+async def run(args) -> dict:
+    # The app reads its settings at import time, so the upstream has to be
+    # chosen before app.main is imported
+    os.environ.setdefault("TINYFISH_API_KEY", "load-test")
+    fake = None
+    if args.upstream == "fake":
+        fake_port = free_port()
+        os.environ["TINYFISH_API_URL"] = f"http://127.0.0.1:{fake_port}{RUN_SSE_PATH}"
+        fake = await start_server(
+            create_app(load_profiles(args.profile), args.time_scale, args.seed), fake_port
+        )
+    else:
+        os.environ["TINYFISH_CASSETTE_MODE"] = "replay"
+        os.environ["TINYFISH_CASSETTE_DIR"] = args.cassettes
+        os.environ["TINYFISH_REPLAY_SPEED"] = str(args.replay_speed)
+
+    from app.main import app
+
+    app_port = free_port()
+    server = await start_server(app, app_port)
+    search_url = f"http://127.0.0.1:{app_port}/api/search"
+    # Distinct keywords make distinct board URLs, so not every search is a
+    # cache hit or shares another client's agent runs
+    bodies = [
+        {
+            "keywords": f"{args.keywords} {i % args.distinct_queries}" if args.distinct_queries > 1
+            else args.keywords,
+            "location": args.location,
+            "job_boards": args.boards,
+        }
+        for i in range(args.clients)
+    ]
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    memory: List[int] = []
+    monitors = [
+        asyncio.create_task(watch_loop_lag(lags, stop)),
+        asyncio.create_task(watch_memory(memory, stop)),
+    ]
+    baseline_rss = rss_bytes()
+
+    limits = httpx.Limits(max_connections=args.clients + 10, max_keepalive_connections=args.clients + 10)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(args.timeout), limits=limits) as client:
+        started = time.perf_counter()
+        tasks = []
+        for i, body in enumerate(bodies):
+            if args.ramp and i:
+                await asyncio.sleep(args.ramp / args.clients)
+            tasks.append(asyncio.create_task(one_search(client, search_url, body)))
+        results = await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+
+        upstream = None
+        if fake is not None:
+            upstream = (await client.get(f"http://127.0.0.1:{fake_port}/stats")).json()
+
+    stop.set()
+    await asyncio.gather(*monitors)
+    await stop_server(*server)
+    if fake is not None:
+        await stop_server(*fake)
+
+    completed = [r for r in results if r["completed"] is not None]
+    peak_rss = max(memory, default=baseline_rss)
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "config": {
+            "clients": args.clients,
+            "distinct_queries": args.distinct_queries,
+            "boards": args.boards,
+            "upstream": args.upstream,
+            "time_scale": args.time_scale if args.upstream == "fake" else None,
+            "replay_speed": args.replay_speed if args.upstream == "replay" else None,
+            "ramp_seconds": args.ramp,
+            "seed": args.seed,
+        },
+        "wall_seconds": round(wall, 3),
+        "searches": {"completed": len(completed), "failed": len(results) - len(completed)},
+        "errors": sorted({r["error"] for r in results if r["error"]}),
+        "throughput": {
+            "searches_per_second": round(len(completed) / wall, 3),
+            "events_per_second": round(sum(r["events"] for r in results) / wall, 1),
+            "bytes_per_second": round(sum(r["bytes"] for r in results) / wall, 1),
+        },
+        "time_to_first_event": summarize([r["first_event"] for r in results if r["first_event"] is not None]),
+        "time_to_first_job": summarize([r["first_job"] for r in results if r["first_job"] is not None]),
+        "completion_latency": summarize([r["completed"] for r in completed]),
+        "memory": {
+            "baseline_rss_bytes": baseline_rss,
+            "peak_rss_bytes": peak_rss,
+            "per_connection_bytes": int((peak_rss - baseline_rss) / max(1, args.clients)),
+        },
+        "event_loop_lag": summarize(lags),
+        "upstream_runs": upstream,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent SSE searches")
+    parser.add_argument("--distinct-queries", type=int, default=20,
+                        help="Distinct keyword sets the clients cycle through (1 = everyone searches the same)")
+    parser.add_argument("--keywords", default="AI Engineer")
+    parser.add_argument("--location", default="Remote")
+    parser.add_argument("--boards", type=lambda value: value.split(","), default=BOARDS,
+                        help="Comma-separated board ids")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which to start the clients")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Client read timeout per stream")
+    parser.add_argument("--upstream", choices=["fake", "replay"], default="fake")
+    parser.add_argument("--profile", help="Fake TinyFish profile overrides (JSON)")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Fake TinyFish latency multiplier")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cassettes", default="cassettes", help="Cassette directory for --upstream replay")
+    parser.add_argument("--replay-speed", type=float, default=0.0, help="Replay speed-up (0 = no delays)")
+    parser.add_argument("--output", help="Write the JSON result here as well")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
@@ -0,0 +1,150 @@
+"""
+Benchmark of the posted_date freshness check against the implementation it
+replaced, on the mixed posted_date strings of benchmarks/hot_paths.py:
+
+- legacy: the old is_within_max_age, kept verbatim below (datetime.now(),
+  inline re.search and up to seven strptime attempts per job)
+- is_within_max_age: the current per-job check
+- filter_recent_jobs: what run_agent does with a COMPLETE result,
+  normalize_jobs (parsing each posted_date into posted_at) and then one
+  cutoff for the whole batch
+
+The parse cache is cleared before every timed run so the numbers include
+filling it. Also reports how many decisions differ from the legacy
+function, and every string that does, so behaviour changes are visible.
+Output is JSON like the other benchmarks.
+
+Usage (from backend/):
+    python -m benchmarks.posted_date [--size 1000000] [--repeat 3] [--output result.json]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from app.models.schemas import JobBoard
+from app.routers.search import MAX_AGE_HOURS, filter_recent_jobs, is_within_max_age, normalize_jobs
+from app.utils.posted_date import _parse
+from benchmarks.common import git_commit
+from benchmarks.hot_paths import posted_dates
+
+
+def legacy_is_within_max_age(posted_date: str | None) -> bool:
+    if not posted_date:
+        return False
+
+    text = posted_date.lower().strip()
+    now = datetime.now()
+    cutoff = now - timedelta(hours=MAX_AGE_HOURS)
+
+    if any(kw in text for kw in ["just", "now", "today", "moment", "recently"]):
+        return True
+
+    match = re.search(r"(\d+)\s*(second|minute|hour|day|week|month|year)s?\s*ago", text)
+    if match:
+        num = int(match.group(1))
+        unit = match.group(2)
+        hours_map = {
+            "second": 0, "minute": 0, "hour": 1,
+            "day": 24, "week": 168, "month": 730, "year": 8760,
+        }
+        total_hours = num * hours_map.get(unit, 0)
+        return total_hours <= MAX_AGE_HOURS
+
+    match = re.search(r"(\d+)\s*(s|m|h|d|w|mo|yr)", text)
+    if match:
+        num = int(match.group(1))
+        unit = match.group(2)
+        unit_map = {"s": 0, "m": 0, "h": 1, "d": 24, "w": 168, "mo": 730, "yr": 8760}
+        hours = num * unit_map.get(unit, 0)
+        return hours <= MAX_AGE_HOURS
+
+    date_formats = [
+        "%Y-%m-%d",
+        "%m/%d/%Y",
+        "%m-%d-%Y",
+        "%b %d, %Y",
+        "%B %d, %Y",
+        "%d %b %Y",
+        "%d %B %Y",
+    ]
+    for fmt in date_formats:
+        try:
+            parsed = datetime.strptime(posted_date.strip(), fmt)
+            return parsed >= cutoff
+        except ValueError:
+            continue
+
+    return False
+
+
+def run(size: int, repeat: int, seed: int) -> dict:
+    dates = posted_dates(random.Random(seed), size, "mixed")
+    jobs = [{"posted_date": date} for date in dates]
+    cases: Dict[str, Callable[[], object]] = {
+        "legacy": lambda: [legacy_is_within_max_age(d) for d in dates],
+        "is_within_max_age": lambda: [is_within_max_age(d) for d in dates],
+        "filter_recent_jobs": lambda: filter_recent_jobs(normalize_jobs(JobBoard.LINKEDIN, jobs)),
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        timings = []
+        for _ in range(repeat):
+            _parse.cache_clear()
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        results[name] = {
+            "seconds": round(best, 5),
+            "ns_per_item": round(best / size * 1e9, 1),
+            "items_per_second": int(size / best),
+        }
+        print(f"{name:>20} {size:>9,} items  {best * 1000:10.2f} ms  "
+              f"{best / size * 1e9:9.1f} ns/item", file=sys.stderr)
+
+    legacy = results["legacy"]["seconds"]
+    for name in ("is_within_max_age", "filter_recent_jobs"):
+        results[name]["speedup"] = round(legacy / results[name]["seconds"], 1)
+
+    # Decisions per distinct string; the strings repeat, so this is cheap
+    differing = Counter()
+    for date, count in Counter(dates).items():
+        if legacy_is_within_max_age(date) != is_within_max_age(date):
+            differing[date] = count
+
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "items": size,
+        "repeat": repeat,
+        "results": results,
+        "agreement": round(1 - sum(differing.values()) / size, 4),
+        "differing": [
+            {"posted_date": date, "count": count,
+             "legacy": legacy_is_within_max_age(date), "now": is_within_max_age(date)}
+            for date, count in differing.most_common()
+        ],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="posted_date strings per run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON result here as well")
+    args = parser.parse_args()
+
+    result = run(args.size, args.repeat, args.seed)
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
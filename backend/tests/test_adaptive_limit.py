@@ -0,0 +1,76 @@
+"""AdaptiveLimit's overload signals, and the limit it settles at in simulation."""
+import random
+
+import pytest
+
+from app.models.schemas import JobBoard
+from app.services.board_stats import OUTCOME_OK, OUTCOME_TIMEOUT
+from app.services.limiter import AdaptiveLimit, ConcurrencyLimiter
+from benchmarks.adaptive_limiter_sim import capacity_phases, follows_capacity, simulate
+
+# Latency shapes of benchmarks/fake_tinyfish.py's built-in profiles
+SIGMAS = {
+    JobBoard.LINKEDIN: 0.4, JobBoard.INDEED: 0.4, JobBoard.WELLFOUND: 0.4,
+    JobBoard.YC_JOBS: 0.4, JobBoard.LEVELS_FYI: 0.4, JobBoard.GLASSDOOR: 0.9,
+}
+
+
+def make_limit() -> AdaptiveLimit:
+    return AdaptiveLimit(ConcurrencyLimiter(limit=20), cooldown=0)
+
+
+def test_healthy_long_tail_does_not_lower_the_limit():
+    rng = random.Random(0)
+    control = make_limit()
+    for _ in range(5000):
+        board = rng.choice(list(SIGMAS))
+        control.on_result(board, 60 * rng.lognormvariate(0, SIGMAS[board]), OUTCOME_OK)
+    assert control.decreases == 0
+    assert control.limiter.limit == 20
+
+
+def test_board_that_gets_slower_lowers_the_limit():
+    rng = random.Random(0)
+    control = make_limit()
+    for _ in range(1000):
+        control.on_result(JobBoard.GLASSDOOR, 60 * rng.lognormvariate(0, 0.9), OUTCOME_OK)
+    for _ in range(200):
+        control.on_result(JobBoard.GLASSDOOR, 240 * rng.lognormvariate(0, 0.9), OUTCOME_OK)
+    assert control.decreases >= 1
+    assert control.limiter.limit < 20
+
+
+def test_single_timeout_does_not_lower_the_limit():
+    control = make_limit()
+    for _ in range(10):
+        control.on_result(JobBoard.LINKEDIN, 60, OUTCOME_OK)
+    control.on_result(JobBoard.GLASSDOOR, 300, OUTCOME_TIMEOUT)
+    assert control.decreases == 0
+    assert control.limiter.limit == 20
+
+
+def test_frequent_timeouts_lower_the_limit():
+    control = make_limit()
+    for _ in range(10):
+        control.on_result(JobBoard.LINKEDIN, 60, OUTCOME_OK)
+        control.on_result(JobBoard.LINKEDIN, 300, OUTCOME_TIMEOUT)
+    assert control.decreases >= 1
+    assert control.limiter.limit < 20
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_limit_follows_upstream_capacity(seed):
+    # Same settings as benchmarks/adaptive_limiter_sim.py's defaults. Over
+    # 100 seeds the settled limit stays within 0.7 runs of these bounds.
+    result = capacity_phases([12, 4, 16], phase_seconds=150, clients=40, base_latency=1.0,
+                             max_limit=30, seed=seed, latency_tolerance=1.5, latency_window=10)
+    for phase in result["phases"]:
+        assert follows_capacity(phase, tolerance=0.3, slack=2), phase
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_healthy_long_tail_upstream_never_lowers_the_limit(seed):
+    # Room for every client, lognormal latency like Glassdoor's profile,
+    # production latency settings
+    run = simulate([(40, 0.9, 300)], clients=40, base_latency=1.0, max_limit=30, seed=seed)
+    assert run["decreases"] == 0
@@ -0,0 +1,83 @@
+"""The per-board circuit breaker's closed / open / half-open cycle."""
+import pytest
+
+from app.models.schemas import JobBoard
+from app.services import breaker as breaker_module
+from app.services.breaker import CLOSED, HALF_OPEN, OPEN, BoardBreakers, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for time.monotonic, as seen by the breaker."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=3, reset_timeout=60, probe_timeout=300)
+    for _ in range(3):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_consecutive_failures(clock):
+    breaker = CircuitBreaker(threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 60
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = open_breaker()
+    clock[0] += 60
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    breaker = open_breaker()
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = open_breaker()
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock[0] += 60
+    assert breaker.allow()
+
+
+def test_probe_that_never_reports_back_is_given_up_on(clock):
+    breaker = open_breaker()
+    clock[0] += 60
+    assert breaker.allow()
+    clock[0] += 299
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+
+
+def test_each_board_has_its_own_breaker(clock):
+    breakers = BoardBreakers(threshold=1)
+    breakers[JobBoard.LINKEDIN].record_failure()
+    assert breakers[JobBoard.LINKEDIN].state == OPEN
+    assert breakers[JobBoard.INDEED].state == CLOSED
+    assert set(breakers.snapshot()) == {"linkedin", "indeed"}
@@ -0,0 +1,166 @@
+"""RedisCacheBackend against the RESP stand-in in benchmarks/fake_redis.py."""
+import asyncio
+
+import pytest
+
+from app.services.cache_backends import RedisCacheBackend, RedisProtocolError, SQLiteCacheBackend
+from benchmarks.fake_redis import FakeRedis, start_fake_redis
+
+
+def run_with_backend(test, password=None):
+    """Run `test(backend, fake)` against a fresh stand-in server."""
+
+    async def main():
+        fake = FakeRedis(password=password)
+        server, port = await start_fake_redis(fake)
+        auth = f":{password}@" if password else ""
+        backend = RedisCacheBackend(f"redis://{auth}127.0.0.1:{port}/0")
+        try:
+            await test(backend, fake)
+        finally:
+            await backend.close()
+            server.close()
+
+    asyncio.run(main())
+
+
+def test_get_set_delete():
+    async def test(backend, fake):
+        assert await backend.get("missing") is None
+        await backend.set("jobs", [{"title": "AI Engineer"}], ttl=60)
+        assert await backend.get("jobs") == [{"title": "AI Engineer"}]
+        await backend.delete("jobs")
+        assert await backend.get("jobs") is None
+
+    run_with_backend(test)
+
+
+def test_values_expire_after_ttl():
+    async def test(backend, fake):
+        await backend.set("short", "value", ttl=0.05)
+        await backend.set("long", "value", ttl=60)
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.get("long") == "value"
+
+    run_with_backend(test)
+
+
+def test_oversized_values_are_not_stored():
+    async def test(backend, fake):
+        backend.max_value_bytes = 10
+        await backend.set("big", "x" * 100, ttl=60)
+        assert await backend.get("big") is None
+        assert fake.commands["SET"] == 0
+
+    run_with_backend(test)
+
+
+def test_lock_is_exclusive_until_released():
+    async def test(backend, fake):
+        token = await backend.acquire_lock("linkedin", ttl=60)
+        assert token is not None
+        assert await backend.acquire_lock("linkedin", ttl=60) is None
+        assert await backend.acquire_lock("indeed", ttl=60) is not None
+
+        # Releasing with someone else's token leaves the lock held
+        await backend.release_lock("linkedin", "not-the-token")
+        assert await backend.acquire_lock("linkedin", ttl=60) is None
+
+        await backend.release_lock("linkedin", token)
+        assert await backend.acquire_lock("linkedin", ttl=60) is not None
+
+    run_with_backend(test)
+
+
+def test_lock_expires_after_ttl():
+    async def test(backend, fake):
+        assert await backend.acquire_lock("linkedin", ttl=0.05) is not None
+        await asyncio.sleep(0.1)
+        assert await backend.acquire_lock("linkedin", ttl=60) is not None
+
+    run_with_backend(test)
+
+
+def test_extend_lock_only_while_held():
+    async def test(backend, fake):
+        token = await backend.acquire_lock("linkedin", ttl=0.1)
+        assert await backend.extend_lock("linkedin", token, ttl=60)
+        await asyncio.sleep(0.15)
+        assert await backend.acquire_lock("linkedin", ttl=60) is None
+
+        assert not await backend.extend_lock("linkedin", "not-the-token", ttl=60)
+        assert not await backend.extend_lock("indeed", token, ttl=60)
+
+    run_with_backend(test)
+
+
+def test_sqlite_extend_lock_only_while_held(tmp_path):
+    async def main():
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        token = await backend.acquire_lock("linkedin", ttl=0.1)
+        assert await backend.extend_lock("linkedin", token, ttl=60)
+        await asyncio.sleep(0.15)
+        assert await backend.acquire_lock("linkedin", ttl=60) is None
+        assert not await backend.extend_lock("linkedin", "not-the-token", ttl=60)
+
+        await backend.release_lock("linkedin", token)
+        assert not await backend.extend_lock("linkedin", token, ttl=60)
+        await backend.close()
+
+    asyncio.run(main())
+
+
+def test_take_token_allows_burst_then_waits():
+    async def test(backend, fake):
+        waits = [await backend.take_token("tinyfish", rate=1.0, burst=3) for _ in range(4)]
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert 0.5 < waits[3] <= 1.0
+        # Other buckets are independent
+        assert await backend.take_token("other", rate=1.0, burst=1) == 0.0
+
+    run_with_backend(test)
+
+
+def test_cancelled_command_does_not_leak_its_reply():
+    async def test(backend, fake):
+        await backend.set("first", {"for": "first"}, ttl=60)
+        await backend.set("second", {"for": "second"}, ttl=60)
+
+        fake.reply_delay = 0.2
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(backend.get("first"), timeout=0.05)
+        fake.reply_delay = 0.0
+
+        assert await backend.get("second") == {"for": "second"}
+
+    run_with_backend(test)
+
+
+def test_reconnects_after_connection_is_dropped():
+    async def test(backend, fake):
+        await backend.set("jobs", "value", ttl=60)
+        backend._writer.close()
+        assert await backend.get("jobs") == "value"
+
+    run_with_backend(test)
+
+
+def test_authenticates_with_url_password():
+    async def test(backend, fake):
+        await backend.set("jobs", "value", ttl=60)
+        assert await backend.get("jobs") == "value"
+        assert fake.commands["AUTH"] == 1
+
+    run_with_backend(test, password="secret")
+
+
+def test_error_replies_raise():
+    async def test(backend, fake):
+        with pytest.raises(RedisProtocolError):
+            await backend.command("NOSUCHCOMMAND")
+        # The connection is still usable afterwards
+        await backend.set("jobs", "value", ttl=60)
+        assert await backend.get("jobs") == "value"
+
+    run_with_backend(test)
@@ -0,0 +1,56 @@
+"""Recording TinyFish sessions to cassettes and replaying them."""
+import asyncio
+import os
+import threading
+
+import httpx
+
+from app.services.cassettes import CassetteStore, RecordingTransport, ReplayTransport
+
+BOARD_URL = "https://www.linkedin.com/jobs/search?keywords=ai"
+BODY = 'data: {"type": "STATUS", "message": "Navigating..."}\n\ndata: {"type": "COMPLETE"}\n\n'
+
+
+async def post(transport: httpx.AsyncBaseTransport, url: str = BOARD_URL) -> httpx.Response:
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post("https://agent.tinyfish.ai/v1/automation/run-sse", json={"url": url})
+        await response.aread()
+        return response
+
+
+def test_recorded_session_replays(tmp_path):
+    def upstream(request):
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, text=BODY)
+
+    async def main():
+        recorded = await post(RecordingTransport(httpx.MockTransport(upstream), CassetteStore(str(tmp_path))))
+        replayed = await post(ReplayTransport(CassetteStore(str(tmp_path)), speed=0))
+        missing = await post(ReplayTransport(CassetteStore(str(tmp_path)), speed=0), "https://example.com")
+        return recorded, replayed, missing
+
+    recorded, replayed, missing = asyncio.run(main())
+    assert recorded.text == BODY
+    assert replayed.status_code == 200
+    assert replayed.text == BODY
+    assert replayed.headers["content-type"] == "text/event-stream"
+    assert missing.status_code == 404
+
+
+def test_concurrent_saves_for_one_url_stay_intact(tmp_path):
+    store = CassetteStore(str(tmp_path))
+    sessions = [
+        # Incompressible, so each save takes many writes to the file
+        {"url": BOARD_URL, "status": 200, "headers": {}, "chunks": [[0.0, os.urandom(500_000).hex()]]}
+        for _ in range(8)
+    ]
+    threads = [threading.Thread(target=store.save, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    replay = CassetteStore(str(tmp_path))
+    saved = [replay.next_session(BOARD_URL) for _ in sessions]
+    assert sorted(session["chunks"][0][1] for session in saved) == sorted(
+        session["chunks"][0][1] for session in sessions
+    )
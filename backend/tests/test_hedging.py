@@ -0,0 +1,91 @@
+"""Racing a backup agent run against a slow one."""
+import asyncio
+
+from app.services.hedging import HedgeBudget, hedged_events
+
+COMPLETE = {"type": "COMPLETE", "resultJson": {"jobs": []}}
+
+
+class Run:
+    """A fake agent run: yields `events` after `delay` seconds each, and records cancellation."""
+
+    def __init__(self, events, delay=0.0):
+        self.events = events
+        self.delay = delay
+        self.cancelled = False
+
+    async def stream(self):
+        try:
+            for event in self.events:
+                await asyncio.sleep(self.delay)
+                yield event
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def collect(primary, hedge, hedge_after, budget=None):
+    async def main():
+        return [event async for event in hedged_events(
+            primary.stream(), lambda: hedge and hedge.stream(), hedge_after, budget
+        )]
+
+    return asyncio.run(main())
+
+
+def test_fast_primary_needs_no_hedge():
+    primary = Run([{"type": "STATUS", "message": "Navigating..."}, COMPLETE])
+    hedge = Run([COMPLETE])
+    assert collect(primary, hedge, hedge_after=1.0) == primary.events
+
+
+def test_backup_that_completes_first_wins_and_the_primary_is_cancelled():
+    primary = Run([{"type": "STATUS", "message": "Navigating..."}, COMPLETE], delay=0.5)
+    backup_complete = {"type": "COMPLETE", "resultJson": {"jobs": [{"title": "AI Engineer"}]}}
+    hedge = Run([{"type": "STATUS", "message": "Backup navigating..."}, backup_complete], delay=0.01)
+    budget = HedgeBudget()
+
+    events = collect(primary, hedge, hedge_after=0.05, budget=budget)
+    assert events[0]["type"] == "STATUS" and "backup" in events[0]["message"]
+    # Progress comes from the primary only
+    assert all(event["message"] != "Backup navigating..." for event in events if event["type"] == "STATUS")
+    assert events[-1] == backup_complete
+    assert primary.cancelled
+    assert budget.wins == 1
+
+
+def test_primary_that_completes_first_cancels_the_backup():
+    primary = Run([COMPLETE], delay=0.1)
+    hedge = Run([COMPLETE], delay=1.0)
+    events = collect(primary, hedge, hedge_after=0.05)
+    assert events[-1] == COMPLETE
+    assert hedge.cancelled
+
+
+def test_error_waits_for_the_other_run():
+    primary = Run([{"type": "ERROR", "message": "blocked"}], delay=0.1)
+    hedge = Run([COMPLETE], delay=0.1)
+    assert collect(primary, hedge, hedge_after=0.05)[-1] == COMPLETE
+
+    primary = Run([{"type": "ERROR", "message": "blocked"}], delay=0.1)
+    hedge = Run([{"type": "ERROR", "message": "also blocked"}], delay=0.1)
+    events = collect(primary, hedge, hedge_after=0.05)
+    assert events[-1]["type"] == "ERROR"
+    assert [event for event in events if event["type"] == "ERROR"] == [events[-1]]
+
+
+def test_no_backup_when_none_can_be_started():
+    primary = Run([COMPLETE], delay=0.1)
+    events = collect(primary, None, hedge_after=0.01)
+    assert events == [COMPLETE]
+
+
+def test_budget_allows_one_hedge_per_ratio_of_runs():
+    budget = HedgeBudget(ratio=0.1)
+    for _ in range(9):
+        budget.record_run()
+    assert not budget.allows_hedge()
+    budget.record_run()
+    assert budget.allows_hedge()
+    budget.record_hedge()
+    assert not budget.allows_hedge()
@@ -0,0 +1,62 @@
+"""ConcurrencyLimiter's FIFO queue and per-board caps."""
+from app.models.schemas import JobBoard
+from app.services.limiter import ConcurrencyLimiter
+
+
+def test_waiters_are_served_in_arrival_order():
+    limiter = ConcurrencyLimiter(limit=1, default_board_limit=5)
+    running = limiter.enqueue(JobBoard.LINKEDIN)
+    first = limiter.enqueue(JobBoard.INDEED)
+    second = limiter.enqueue(JobBoard.GLASSDOOR)
+    assert running.granted
+    assert (first.granted, first.position) == (False, 1)
+    assert (second.granted, second.position) == (False, 2)
+    assert limiter.queue_depth == 2
+
+    limiter.release(running)
+    assert first.granted
+    assert (second.granted, second.position) == (False, 1)
+
+
+def test_board_at_its_cap_does_not_hold_up_other_boards():
+    limiter = ConcurrencyLimiter(limit=10, board_limits={JobBoard.LINKEDIN: 1}, default_board_limit=5)
+    running = limiter.enqueue(JobBoard.LINKEDIN)
+    blocked = limiter.enqueue(JobBoard.LINKEDIN)
+    other = limiter.enqueue(JobBoard.INDEED)
+    assert running.granted and other.granted
+    assert not blocked.granted
+    assert not limiter.has_free_slot(JobBoard.LINKEDIN)
+    assert limiter.try_acquire(JobBoard.LINKEDIN) is None
+
+    limiter.release(running)
+    assert blocked.granted
+
+
+def test_leaving_the_queue_moves_the_waiters_behind_up():
+    limiter = ConcurrencyLimiter(limit=1)
+    running = limiter.enqueue(JobBoard.LINKEDIN)
+    first = limiter.enqueue(JobBoard.INDEED)
+    second = limiter.enqueue(JobBoard.INDEED)
+
+    limiter.release(first)
+    assert second.position == 1
+    limiter.release(running)
+    assert second.granted
+    assert limiter.active == 1
+
+
+def test_raising_the_limit_grants_queued_waiters():
+    limiter = ConcurrencyLimiter(limit=1)
+    limiter.enqueue(JobBoard.LINKEDIN)
+    waiting = limiter.enqueue(JobBoard.INDEED)
+    limiter.set_limit(2)
+    assert waiting.granted
+
+
+def test_try_acquire_never_jumps_the_queue():
+    # A slot is free, but a waiter for another board is queued
+    limiter = ConcurrencyLimiter(limit=10, board_limits={JobBoard.LINKEDIN: 1})
+    limiter.enqueue(JobBoard.LINKEDIN)
+    limiter.enqueue(JobBoard.LINKEDIN)
+    assert limiter.try_acquire(JobBoard.INDEED) is None
+    assert limiter.queue_depth == 1
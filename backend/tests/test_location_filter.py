@@ -0,0 +1,29 @@
+"""Local location filtering for boards whose search URL ignores the location."""
+import asyncio
+
+from app.models.schemas import AgentStatus, JobBoard
+from app.routers import search
+from app.services.job_boards import board_uses_location
+
+JOBS = [
+    {"title": "AI Engineer", "location": "San Francisco, CA"},
+    {"title": "ML Engineer", "location": "New York, NY"},
+]
+
+
+def test_message_names_the_location_as_typed(monkeypatch):
+    board = next(board for board in JobBoard if not board_uses_location(board))
+
+    async def board_updates(*args):
+        yield {"board": board.value, "status": AgentStatus.COMPLETED.value,
+               "message": f"Found {len(JOBS)} jobs (cached)", "jobs": JOBS}
+
+    monkeypatch.setattr(search, "board_updates", board_updates)
+    monkeypatch.setattr(search.cache_warmer, "record", lambda board, url: None)
+
+    async def main():
+        return [update async for update in search.search_single_board(board, "AI Engineer", "  San  Francisco ")]
+
+    update, = asyncio.run(main())
+    assert update["jobs"] == JOBS[:1]
+    assert update["message"] == "Found 1 jobs in San Francisco (cached)"
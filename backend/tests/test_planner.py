@@ -0,0 +1,32 @@
+"""Per-board search planning against a latency budget."""
+from app.models.schemas import JobBoard
+from app.services.board_stats import OUTCOME_OK, BoardStats
+from app.services.planner import ACTION_RUN, ACTION_SKIP, plan_board
+
+
+def stats_with_latency(seconds: float) -> BoardStats:
+    stats = BoardStats()
+    for _ in range(20):
+        stats.record(JobBoard.LINKEDIN, seconds, OUTCOME_OK, 10)
+    return stats
+
+
+def test_reason_says_which_check_let_the_board_run():
+    slow = stats_with_latency(120)
+    assert plan_board(JobBoard.LINKEDIN, slow, None, None, 600)["reason"] == "No latency budget"
+    assert plan_board(JobBoard.LINKEDIN, BoardStats(), 30, None, 600)["reason"] == "No run history yet"
+    plan = plan_board(JobBoard.LINKEDIN, stats_with_latency(10), 30, None, 600)
+    assert plan["action"] == ACTION_RUN
+    assert plan["reason"] == "Expected to finish within the budget"
+
+
+def test_board_slower_than_budget_is_skipped():
+    plan = plan_board(JobBoard.LINKEDIN, stats_with_latency(120), 30, None, 600)
+    assert plan["action"] == ACTION_SKIP
+
+
+def test_reason_shows_sub_second_predictions():
+    plan = plan_board(JobBoard.LINKEDIN, stats_with_latency(0.4), 0.2, None, 600)
+    assert plan["reason"] == "Usually takes about 0.4s, more than the 0.2s budget"
+    plan = plan_board(JobBoard.LINKEDIN, stats_with_latency(120), 30, None, 600)
+    assert plan["reason"] == "Usually takes about 120s, more than the 30s budget"
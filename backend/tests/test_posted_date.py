@@ -0,0 +1,103 @@
+"""The posted_date parser behind the 72 h freshness filter."""
+import asyncio
+import time
+
+import pytest
+
+from app.models.schemas import JobBoard
+from app.routers import search
+from app.routers.search import MAX_AGE_HOURS, filter_recent_jobs, is_within_max_age, normalize_jobs
+
+NOW = time.time()
+
+RECENT = [
+    "just now", "today", "Just posted", "a moment ago", "3 hours ago", "an hour ago", "3 days ago",
+    "2 mins ago", "30 mins ago", "45 secs ago", "1 hr ago", "5 hrs ago", "3 hours", "2 days",
+    "1d", "3d", "Posted 2d ago", "Active 3h ago", "2d+", "Reposted 1 day ago",
+    time.strftime("%Y-%m-%d", time.localtime(NOW)),
+    time.strftime("%b %d, %Y", time.localtime(NOW - 86400)),
+    time.strftime("%d %B %Y", time.localtime(NOW - 86400)),
+]
+
+OLD = [
+    "4 days ago", "5 days", "1 week ago", "2 wks ago", "30+ days ago", "1 month ago", "1mo", "2 mo ago",
+    "3 yrs ago", "4d", "1w", "Feb 10, 2020", "10 Mar 2020", "02/10/2020", "2020-02-10",
+]
+
+UNPARSEABLE = ["", None, "Reposted", "N/A", "unknown", "02/30/2026"]
+
+
+@pytest.mark.parametrize("posted_date", RECENT)
+def test_recent_dates_are_kept(posted_date):
+    assert is_within_max_age(posted_date, NOW)
+
+
+@pytest.mark.parametrize("posted_date", OLD + UNPARSEABLE)
+def test_old_and_unparseable_dates_are_dropped(posted_date):
+    assert not is_within_max_age(posted_date, NOW)
+
+
+def test_filter_recent_jobs_matches_per_job_check():
+    jobs = [{"posted_date": date} for date in RECENT + OLD + UNPARSEABLE]
+    assert filter_recent_jobs(jobs, NOW) == [{"posted_date": date} for date in RECENT]
+
+
+def test_normalize_jobs_parses_posted_at_once():
+    jobs = normalize_jobs(JobBoard.LINKEDIN, [{"posted_date": "2 days ago"}, {"posted_date": "N/A"}], NOW)
+    assert jobs[0]["posted_at"] == NOW - 2 * 86400
+    assert jobs[1]["posted_at"] is None
+
+
+def test_relative_dates_age_after_ingest():
+    # Recent when fetched; five hours later "70 hours ago" is past the window
+    jobs = normalize_jobs(JobBoard.LINKEDIN, [{"posted_date": "70 hours ago"}, {"posted_date": "1 hour ago"}], NOW)
+    assert filter_recent_jobs(jobs, NOW) == jobs
+    assert filter_recent_jobs(jobs, NOW + 5 * 3600) == jobs[1:]
+
+
+def test_relative_dates_count_back_from_now():
+    assert is_within_max_age(f"{MAX_AGE_HOURS} hours ago", NOW)
+    assert not is_within_max_age(f"{MAX_AGE_HOURS + 1} hours ago", NOW)
+
+
+def serve_from_cache(monkeypatch, jobs, age):
+    """Updates of board_updates for a cache entry stored `age` seconds ago."""
+
+    async def get_stale(url):
+        return jobs, age
+
+    async def get_failure(url):
+        return {"kind": "error", "message": "Agent timed out", "retry_in": 30}
+
+    monkeypatch.setattr(search.result_cache, "get_stale", get_stale)
+    monkeypatch.setattr(search.result_cache, "get_failure", get_failure)
+
+    async def main():
+        return [update async for update in search.board_updates(JobBoard.LINKEDIN, "https://example.com")]
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("age", [60, 3600])
+def test_cached_jobs_that_aged_out_are_not_served(monkeypatch, age):
+    # Both were within MAX_AGE_HOURS when cached; one has aged out since
+    fresh = {"posted_date": "today"}
+    aged = {"posted_date": time.strftime("%Y-%m-%d", time.localtime(time.time() - (MAX_AGE_HOURS + 24) * 3600))}
+
+    updates = serve_from_cache(monkeypatch, [fresh, aged], age)
+    assert updates[0]["jobs"] == [fresh]
+    assert updates[0]["message"].startswith("Found 1 jobs")
+
+
+@pytest.mark.parametrize("with_posted_at", [True, False])
+def test_cached_relative_dates_age_from_when_they_were_stored(monkeypatch, with_posted_at):
+    # Stored five hours ago, when "70 hours ago" was still in the window
+    age = 5 * 3600
+    raw = [{"posted_date": "3 days ago"}, {"posted_date": "70 hours ago"}, {"posted_date": "2h"}]
+    if with_posted_at:
+        jobs = normalize_jobs(JobBoard.LINKEDIN, raw, time.time() - age)
+    else:
+        jobs = raw
+
+    updates = serve_from_cache(monkeypatch, jobs, age)
+    assert [job["posted_date"] for job in updates[0]["jobs"]] == ["2h"]
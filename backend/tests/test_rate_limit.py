@@ -0,0 +1,54 @@
+"""The client-side TinyFish token bucket, without a shared cache backend."""
+import asyncio
+
+import pytest
+
+from app.services import rate_limit
+from app.services.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for time.monotonic, as seen by the bucket."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_refill_at_rate(clock):
+    bucket = TokenBucket(rate_per_minute=60, burst=3)
+    assert [bucket._take_local() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._take_local() == pytest.approx(1.0)
+
+    clock[0] += 2.5
+    assert bucket._take_local() == 0.0
+    assert bucket._take_local() == 0.0
+    assert bucket._take_local() == pytest.approx(0.5)
+
+
+def test_refill_stops_at_burst(clock):
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    clock[0] += 3600
+    assert [bucket._take_local() for _ in range(2)] == [0.0, 0.0]
+    assert bucket._take_local() > 0
+
+
+def test_disabled_bucket_never_waits():
+    bucket = TokenBucket(rate_per_minute=0)
+    assert not bucket.enabled
+    assert asyncio.run(bucket.acquire()) == 0.0
+
+
+def test_callers_wait_their_turn_for_a_token():
+    # 10 tokens a second, no burst: the third caller waits about 0.2 s
+    bucket = TokenBucket(rate_per_minute=600, burst=1)
+
+    async def main():
+        return await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+
+    waits = asyncio.run(main())
+    assert waits[0] < 0.05
+    assert 0.07 < waits[1] < 0.5
+    assert 0.17 < waits[2] < 0.6
+    assert waits == sorted(waits)
+    assert bucket.waiting == 0
@@ -0,0 +1,82 @@
+"""run_board's cross-worker lock on a board search."""
+import asyncio
+
+from app.models.schemas import AgentStatus, JobBoard
+from app.routers import search
+
+URL = "https://www.linkedin.com/jobs/search?keywords=ai"
+
+
+def collect(monkeypatch, shared=None, failure=None, agent_seconds=0.0):
+    """Updates of a run_board whose lock is free, with the shared cache and
+    failure record it finds once it holds the lock. Returns them and the
+    lock calls made."""
+    calls = []
+
+    async def acquire(url, ttl):
+        calls.append("acquire")
+        return True
+
+    async def release(url):
+        calls.append("release")
+
+    async def get_shared_since(url, since):
+        return shared
+
+    async def get_failure(url):
+        return failure
+
+    async def run_agent(*args):
+        calls.append("run_agent")
+        await asyncio.sleep(agent_seconds)
+        yield {"board": JobBoard.LINKEDIN.value, "status": AgentStatus.COMPLETED.value, "jobs": []}
+
+    monkeypatch.setattr(search.result_cache, "acquire_run_lock", acquire)
+    monkeypatch.setattr(search.result_cache, "release_run_lock", release)
+    monkeypatch.setattr(search.result_cache, "get_shared_since", get_shared_since)
+    monkeypatch.setattr(search.result_cache, "get_failure", get_failure)
+    monkeypatch.setattr(search, "run_agent", run_agent)
+
+    async def main():
+        return [update async for update in search.run_board(JobBoard.LINKEDIN, URL)]
+
+    return asyncio.run(main()), calls
+
+
+def test_runs_the_agent_when_nothing_finished_meanwhile(monkeypatch):
+    updates, calls = collect(monkeypatch)
+    assert calls == ["acquire", "run_agent", "release"]
+    assert updates[-1]["status"] == AgentStatus.COMPLETED.value
+
+
+def test_uses_results_stored_while_taking_the_lock(monkeypatch):
+    updates, calls = collect(monkeypatch, shared=[{"title": "AI Engineer"}])
+    assert calls == ["acquire", "release"]
+    assert updates == [{
+        "board": JobBoard.LINKEDIN.value,
+        "status": AgentStatus.COMPLETED.value,
+        "message": "Found 1 jobs (from another worker)",
+        "jobs": [{"title": "AI Engineer"}],
+    }]
+
+
+def test_uses_failure_recorded_while_taking_the_lock(monkeypatch):
+    failure = {"kind": "error", "message": "Agent timed out", "retry_in": 30}
+    updates, calls = collect(monkeypatch, failure=failure)
+    assert calls == ["acquire", "release"]
+    assert updates[0]["status"] == AgentStatus.ERROR.value
+    assert updates[0]["cached"] is True
+
+
+def test_lock_is_renewed_while_the_run_goes_on(monkeypatch):
+    renewals = []
+
+    async def renew(url, ttl):
+        renewals.append(ttl)
+        return True
+
+    monkeypatch.setattr(search, "WORKER_LOCK_RENEW_INTERVAL", 0.01)
+    monkeypatch.setattr(search.result_cache, "renew_run_lock", renew)
+    collect(monkeypatch, agent_seconds=0.05)
+    assert len(renewals) >= 2
+    assert set(renewals) == {search.WORKER_LOCK_TTL}
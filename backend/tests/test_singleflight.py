@@ -0,0 +1,158 @@
+"""Coalescing concurrent runs into one shared Flight."""
+import asyncio
+import gc
+
+from app.services.singleflight import SingleFlight
+
+
+class Source:
+    """An event source that yields when told to, and records how it ended."""
+
+    def __init__(self, fail_with=None):
+        self.fail_with = fail_with
+        self.started = 0
+        self.cancelled = False
+        self.finished = False
+        self._next = asyncio.Queue()
+
+    def send(self, *events):
+        for event in events:
+            self._next.put_nowait(event)
+
+    def finish(self):
+        self._next.put_nowait(None)
+
+    async def run(self):
+        self.started += 1
+        try:
+            while True:
+                event = await self._next.get()
+                if event is None:
+                    break
+                yield event
+            if self.fail_with is not None:
+                raise self.fail_with
+            self.finished = True
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def collect(flights, key, source, **kwargs):
+    return [event async for event in flights.subscribe(key, source.run, **kwargs)]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_subscribers_share_one_run_and_late_joiners_get_a_replay():
+    async def main():
+        flights, source = SingleFlight(), Source()
+        first = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+        source.send({"n": 1}, {"n": 2})
+        await settle()
+
+        late = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+        source.send({"n": 3})
+        source.finish()
+
+        assert await first == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert await late == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert source.started == 1
+        assert "linkedin" not in flights
+
+    asyncio.run(main())
+
+
+def test_run_is_cancelled_when_the_last_subscriber_leaves():
+    async def main():
+        flights, source = SingleFlight(), Source()
+        first = asyncio.create_task(collect(flights, "linkedin", source))
+        second = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+
+        first.cancel()
+        await settle()
+        assert not source.cancelled
+
+        second.cancel()
+        await settle()
+        assert source.cancelled
+        assert "linkedin" not in flights
+
+    asyncio.run(main())
+
+
+def test_keep_running_and_detach_let_the_run_finish_unwatched():
+    async def main():
+        for keep_running in (True, False):
+            flights, source = SingleFlight(), Source()
+            subscriber = asyncio.create_task(collect(flights, "linkedin", source, keep_running=keep_running))
+            await settle()
+            if not keep_running:
+                flights.detach("linkedin")
+
+            subscriber.cancel()
+            await settle()
+            assert "linkedin" in flights
+
+            source.finish()
+            await settle()
+            assert source.finished
+            assert "linkedin" not in flights
+
+    asyncio.run(main())
+
+
+def test_subscribing_after_a_cancelled_run_starts_a_new_one():
+    async def main():
+        flights, source = SingleFlight(), Source()
+        subscriber = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+        subscriber.cancel()
+
+        # Before the cancelled run has even wound down
+        again = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+        source.send({"n": 1})
+        source.finish()
+        assert await again == [{"n": 1}]
+        assert source.started == 2
+
+    asyncio.run(main())
+
+
+def test_failed_run_ends_with_an_error_event():
+    async def main():
+        flights, source = SingleFlight(), Source(fail_with=RuntimeError("agent crashed"))
+        subscriber = asyncio.create_task(
+            collect(flights, "linkedin", source, on_error=lambda e: {"error": str(e)})
+        )
+        await settle()
+        source.send({"n": 1})
+        source.finish()
+
+        assert await subscriber == [{"n": 1}, {"error": "agent crashed"}]
+        assert "linkedin" not in flights
+
+    asyncio.run(main())
+
+
+def test_failed_run_leaves_no_unretrieved_task_exception():
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        flights, source = SingleFlight(), Source(fail_with=RuntimeError("agent crashed"))
+        subscriber = asyncio.create_task(collect(flights, "linkedin", source))
+        await settle()
+        source.finish()
+        assert await subscriber == []
+
+    asyncio.run(main())
+    gc.collect()
+    assert errors == []
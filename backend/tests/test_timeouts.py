@@ -0,0 +1,38 @@
+"""Per-request agent timeout overrides."""
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import JobBoard, SearchRequest
+from app.routers.search import flight_key
+from app.services.board_stats import BoardStats
+from app.services.timeouts import AGENT_TIMEOUT_MAX, AGENT_TIMEOUT_MIN, learned_timeout
+
+
+@pytest.mark.parametrize("timeout_seconds", [0, -10])
+def test_non_positive_override_is_rejected(timeout_seconds):
+    with pytest.raises(ValidationError):
+        SearchRequest(keywords="AI Engineer", location="Remote", job_boards=["linkedin"],
+                      timeout_seconds=timeout_seconds)
+
+
+@pytest.mark.parametrize("override,expected", [
+    (0.01, AGENT_TIMEOUT_MIN),
+    (AGENT_TIMEOUT_MIN + 1, AGENT_TIMEOUT_MIN + 1),
+    (10_000, AGENT_TIMEOUT_MAX),
+])
+def test_override_is_clamped(override, expected):
+    assert learned_timeout(BoardStats(), JobBoard.LINKEDIN, {}, override) == expected
+
+
+def test_overridden_runs_are_not_shared_with_default_ones():
+    url = "https://www.linkedin.com/jobs/search?keywords=ai"
+    assert flight_key(url) == url
+    assert flight_key(url, 90) != url
+    assert flight_key(url, 90) == flight_key(url, 90.0)
+
+
+@pytest.mark.parametrize("deadline_seconds", [0, -5])
+def test_non_positive_deadline_is_rejected(deadline_seconds):
+    with pytest.raises(ValidationError):
+        SearchRequest(keywords="AI Engineer", location="Remote", job_boards=["linkedin"],
+                      deadline_seconds=deadline_seconds)
@@ -0,0 +1,111 @@
+"""Which TinyFish failures run_tinyfish_agent retries, and how long it waits."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services import tinyfish
+from app.services.retry import TINYFISH_MAX_RETRIES, TINYFISH_RETRY_MAX_DELAY, RetryBudget
+
+COMPLETE = {"type": "COMPLETE", "resultJson": {"jobs": []}}
+
+
+def sse(*events) -> str:
+    return "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+
+
+def run(monkeypatch, responses, retry_budget=None):
+    """
+    Run the agent against a stand-in API answering with `responses` in
+    turn (the last one repeats); an exception instance is raised instead.
+    Returns the events, the number of requests and the retry delays.
+    """
+    requests = []
+    delays = []
+
+    def handler(request):
+        response = responses[min(len(requests), len(responses) - 1)]
+        requests.append(request)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setenv("TINYFISH_API_KEY", "test-key")
+    monkeypatch.setattr(tinyfish, "backoff_delay", lambda attempt: 0.5 * attempt)
+    monkeypatch.setattr(tinyfish.asyncio, "sleep", sleep)
+
+    async def main():
+        monkeypatch.setattr(tinyfish, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        try:
+            return [event async for event in tinyfish.run_tinyfish_agent(
+                "https://example.com/jobs", "Find jobs", retry_budget=retry_budget
+            )]
+        finally:
+            await tinyfish._client.aclose()
+
+    return asyncio.run(main()), len(requests), delays
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_transient_statuses_are_retried(monkeypatch, status):
+    events, requests, delays = run(monkeypatch, [httpx.Response(status), httpx.Response(200, text=sse(COMPLETE))])
+    assert requests == 2
+    assert delays == [0.5]
+    assert events[0]["type"] == "STATUS" and events[0]["retry"] == 1
+    assert events[-1] == COMPLETE
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 500])
+def test_other_statuses_fail_without_retrying(monkeypatch, status):
+    events, requests, delays = run(monkeypatch, [httpx.Response(status, text="nope")])
+    assert requests == 1
+    assert events == [{"type": "ERROR", "message": f"TinyFish API error: {status} - nope"}]
+
+
+def test_connection_errors_and_streams_cut_short_are_retried(monkeypatch):
+    events, requests, delays = run(monkeypatch, [
+        httpx.ConnectError("connection refused"),
+        httpx.Response(200, text=sse({"type": "STATUS", "message": "Navigating..."})),
+        httpx.Response(200, text=sse(COMPLETE)),
+    ])
+    assert requests == 3
+    assert delays == [0.5, 1.0]
+    assert events[-1] == COMPLETE
+
+
+def test_retries_stop_after_max_retries(monkeypatch):
+    events, requests, delays = run(monkeypatch, [httpx.Response(503)])
+    assert requests == TINYFISH_MAX_RETRIES + 1
+    assert events[-1]["type"] == "ERROR"
+
+
+def test_retry_after_is_honoured_up_to_the_cap(monkeypatch):
+    events, requests, delays = run(monkeypatch, [
+        httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, text=sse(COMPLETE)),
+    ])
+    assert delays == [7.0]
+
+    too_long = str(int(TINYFISH_RETRY_MAX_DELAY) + 1)
+    events, requests, delays = run(monkeypatch, [httpx.Response(429, headers={"Retry-After": too_long})])
+    assert requests == 1
+    assert delays == []
+    assert events[-1]["type"] == "ERROR"
+
+
+def test_retries_spend_from_the_shared_budget(monkeypatch):
+    budget = RetryBudget(1)
+    events, requests, delays = run(monkeypatch, [httpx.Response(503)], retry_budget=budget)
+    assert requests == 2
+    assert budget.remaining == 0
+
+    # Another board of the same search gets no retries at all
+    events, requests, delays = run(monkeypatch, [httpx.Response(503)], retry_budget=budget)
+    assert requests == 1
+    assert events[-1]["type"] == "ERROR"
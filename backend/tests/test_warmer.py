@@ -0,0 +1,79 @@
+"""Which board searches the cache warmer keeps warm."""
+import asyncio
+
+import pytest
+
+from app.models.schemas import JobBoard
+from app.services import warmer
+from app.services.warmer import CacheWarmer, QueryPopularity
+
+HALF_LIFE = 3600
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for time.monotonic, as seen by the warmer."""
+    now = [1000.0]
+    monkeypatch.setattr(warmer.time, "monotonic", lambda: now[0])
+    return now
+
+
+def search(popularity, url, times=1):
+    for _ in range(times):
+        popularity.record(JobBoard.LINKEDIN, url)
+
+
+def test_one_off_search_is_not_warmed(clock):
+    popularity = QueryPopularity(half_life=HALF_LIFE, min_score=1.0)
+    search(popularity, "once")
+    assert popularity.top(10) == []
+
+
+def test_repeated_searches_rank_by_decayed_score(clock):
+    popularity = QueryPopularity(half_life=HALF_LIFE, min_score=1.0)
+    search(popularity, "old", times=6)
+    clock[0] += 2 * HALF_LIFE
+    search(popularity, "new", times=2)
+    search(popularity, "newer", times=3)
+    assert [url for _, url in popularity.top(10)] == ["newer", "new", "old"]
+    assert [url for _, url in popularity.top(1)] == ["newer"]
+
+
+def test_searches_stop_being_warmed_and_are_forgotten_as_they_decay(clock):
+    popularity = QueryPopularity(half_life=HALF_LIFE, min_score=1.0)
+    search(popularity, "popular", times=4)
+    clock[0] += 1.5 * HALF_LIFE
+    assert popularity.top(10) == [(JobBoard.LINKEDIN, "popular")]
+
+    # Down to 1 search's worth: no longer warmed, but still remembered
+    clock[0] += 0.5 * HALF_LIFE
+    assert popularity.top(10) == []
+    assert len(popularity) == 1
+
+    # Below half of min_score: forgotten
+    clock[0] += 1.1 * HALF_LIFE
+    popularity.top(10)
+    assert len(popularity) == 0
+
+
+def test_run_once_warms_only_popular_searches_that_need_it():
+    warmed = []
+
+    async def should_warm(url):
+        return url != "fresh"
+
+    async def warm(board, url):
+        warmed.append(url)
+
+    async def main():
+        popularity = QueryPopularity(min_score=1.0)
+        cache_warmer = CacheWarmer(should_warm, warm, popularity=popularity, top_n=10)
+        search(popularity, "popular", times=3)
+        search(popularity, "fresh", times=3)
+        search(popularity, "once")
+        started = await cache_warmer.run_once()
+        await asyncio.gather(*cache_warmer._tasks)
+        return started
+
+    assert asyncio.run(main()) == 1
+    assert warmed == ["popular"]
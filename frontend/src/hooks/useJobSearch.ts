@@ -105,13 +105,15 @@ export function useJobSearch() {
                   }));
 
                   // Aggregate all jobs
-                  if (update.jobs && update.jobs.length > 0) {
+                  if (update.jobs) {
                     setAllJobs((prev) => {
+                      // A refreshed result replaces the board's stale jobs
+                      const kept = prev.filter((p) => p.source !== update.board);
                       // Filter out duplicates by URL
                       const newJobs = update.jobs!.filter(
-                        (job) => !prev.some((p) => p.url === job.url)
+                        (job) => !kept.some((p) => p.url === job.url)
                       );
-                      return [...prev, ...newJobs];
+                      return [...kept, ...newJobs];
                     });
                   }
                 }
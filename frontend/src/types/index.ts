@@ -18,6 +18,7 @@ export interface JobResult {
   url: string;
   source: JobBoard;
   posted_date?: string | null;
+  posted_at?: number | null;
   description?: string | null;
 }
 
@@ -35,6 +36,10 @@ export interface SearchRequest {
   location: string;
   experience_level?: ExperienceLevel;
   job_boards: JobBoard[];
+  allow_stale?: boolean;
+  timeout_seconds?: number;
+  deadline_seconds?: number;
+  finish_in_background?: boolean;
 }
 
 export interface SSEUpdate {
@@ -44,6 +49,11 @@ export interface SSEUpdate {
   streaming_url?: string;
   jobs?: JobResult[];
   error?: string;
+  cached?: boolean;
+  stale?: boolean;
+  age_seconds?: number;
+  timed_out?: boolean;
+  skipped?: boolean;
 }
 
 export const JOB_BOARD_INFO: Record<JobBoard, { name: string; color: string }> = {